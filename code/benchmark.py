@@ -0,0 +1,614 @@
+"""
+Headless benchmarks for SpaceShooties.
+
+Run from the project root so the asset paths resolve, for example:
+    python code/benchmark.py rotation
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from conftest import collision_backends, make_scene, to_field  # Also sets up headless SDL
+import pygame
+import random
+import statistics
+from random import randint
+
+import game
+
+###############################################################################
+#                                   HELPERS                                   #
+###############################################################################
+
+FRAMES = 120  # Frames simulated per measurement
+DT = 1 / game.FPS
+
+
+def time_frames(step, frames=FRAMES):
+    """Call `step()` `frames` times and return the mean frame time in ms."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        step()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def interleaved_medians(steps, frames=FRAMES, repeats=9):
+    """
+    Time each of `steps` with time_frames() `repeats` times, taking turns so
+    drift in machine load hits them all alike. Returns each one's median
+    frame time in ms.
+    """
+    runs = [[] for _ in steps]
+    for _ in range(repeats):
+        for times, step in zip(runs, steps):
+            times.append(time_frames(step, frames))
+    return [statistics.median(times) for times in runs]
+
+
+def spawn_meteors(count, world):
+    """
+    Spawn `count` meteors spread over the screen, spinning in place so they
+    stay in view. They never expire, since the benchmarks do not advance the
+    world's timer wheel.
+    """
+    for _ in range(count):
+        pos = (world.rng.randint(0, game.RENDER_WIDTH), world.rng.randint(0, game.RENDER_HEIGHT))
+        game.Meteor(game.meteor_surface, pos, world).speed = 0
+
+
+def draw_scene(lasers, meteors, explosions):
+    """
+    A headless World to time drawing with: the player mid-screen, `lasers`
+    lasers, `meteors` meteors spinning in place and `explosions` explosions,
+    updated once so meteors and explosions are spread over their frames.
+    """
+    world = make_scene(lasers, 0, 0, player_pos=(game.RENDER_WIDTH / 2, game.RENDER_HEIGHT / 2))
+    spawn_meteors(meteors, world)
+    for _ in range(explosions):
+        pos = (world.rng.uniform(0, game.RENDER_WIDTH), world.rng.uniform(0, game.RENDER_HEIGHT))
+        game.AnimatedExplosion(game.explosion_frames, pos, world)
+    world.all_sprites.update(DT)
+    return world
+
+
+def time_collisions(backend, lasers, meteors, seed, laser_top=0, player_pos=(-1000, -1000)):
+    """
+    Run one collisions() pass with `backend` on a fresh scene.
+    Returns (elapsed ms, (player_hit, score, surviving meteor count)).
+    """
+    game.COLLISION_BACKEND = backend
+    world = make_scene(lasers, meteors, seed, laser_top, player_pos)
+    player, meteor_sprites, laser_sprites = world.player, world.meteor_sprites, world.laser_sprites
+    # Steady state: the broad phase structures were built on previous frames
+    if backend == 'grid':
+        world.meteor_grid.sync(meteor_sprites)
+    elif backend == 'sap':
+        world.collision_sweep.sync([player, *laser_sprites, *meteor_sprites])
+    elif backend == 'field':
+        meteor_sprites = to_field(meteor_sprites)
+    start = time.perf_counter()
+    events = game.collisions(player, meteor_sprites, laser_sprites, world.events,
+                             world.meteor_grid, world.collision_sweep)
+    elapsed = (time.perf_counter() - start) * 1000
+    result = (events.player_hit, game.collision_score(events), len(meteor_sprites))
+    world.close()
+    return elapsed, result
+
+
+###############################################################################
+#                                 BENCHMARKS                                  #
+###############################################################################
+
+def bench_groups(frames=30, churn=0.05):
+    """Per-frame container costs with thousands of lasers: Group vs EntityGroup."""
+    phases = ('update', 'churn', 'contains', 'draw')
+    print(f"{'lasers':>7} {'group':>12} " + ' '.join(f"{p + ' (ms)':>14}" for p in phases))
+    for count in (1000, 5000, 20000):
+        for use_entity_groups in (False, True):
+            game.USE_ENTITY_GROUPS = use_entity_groups
+            world = game.World(0, headless=True)
+            all_sprites, lasers = world.all_sprites, world.laser_sprites
+            rng = world.rng
+            for _ in range(count):
+                pos = (rng.uniform(0, game.RENDER_WIDTH), rng.uniform(0, game.RENDER_HEIGHT))
+                game.Laser(game.laser_surface, pos, world)
+            members = lasers.sprites()
+
+            def respawn():
+                # Kill and respawn a few lasers, as shots land and new ones fire
+                for i in rng.sample(range(count), int(count * churn)):
+                    members[i].kill()
+                    members[i] = game.Laser(game.laser_surface, members[i].rect.midbottom, world)
+
+            timings = (
+                time_frames(lambda: all_sprites.update(0), frames),
+                time_frames(respawn, frames),
+                time_frames(lambda: sum(1 for laser in members if laser in lasers), frames),
+                time_frames(lambda: all_sprites.draw(game.display_surface), frames),
+            )
+            print(f"{count:>7} {type(lasers).__name__:>12} " + ' '.join(f"{t:>14.2f}" for t in timings))
+            world.close()
+    game.USE_ENTITY_GROUPS = True
+
+
+def bench_rotation():
+    """
+    Meteor update + draw cost with and without the rotation cache. Without
+    it, each frame rotates every meteor and builds the collision mask the
+    default COLLISION_FIDELITY needs; the rotate-only column skips the mask,
+    as with 'aabb' and 'circle' tiers.
+    """
+    print(f"{'meteors':>8} {'no cache (ms)':>14} {'rotate only (ms)':>17} {'cache (ms)':>11} "
+          f"{'speedup':>8} {'vs rotate':>10}")
+    game.rotation_cache.frames(game.meteor_surface)
+    fidelity = dict(game.COLLISION_FIDELITY)
+    for count in (50, 200, 1000):
+        results = []
+        for use_cache, tier in ((False, None), (False, 'aabb'), (True, None)):
+            game.USE_ROTATION_CACHE = use_cache
+            if tier is not None:
+                game.COLLISION_FIDELITY = dict.fromkeys(fidelity, tier)
+            world = game.World(0, headless=True)
+            spawn_meteors(count, world)
+            meteors = world.meteor_sprites
+
+            def step():
+                meteors.update(DT)
+                meteors.draw(game.display_surface)
+
+            results.append(time_frames(step))
+            world.close()
+            game.COLLISION_FIDELITY = fidelity
+        print(f"{count:>8} {results[0]:>14.3f} {results[1]:>17.3f} {results[2]:>11.3f} "
+              f"{results[0] / results[2]:>7.1f}x {results[1] / results[2]:>9.1f}x")
+    game.USE_ROTATION_CACHE = True
+
+
+def bench_meteors(frames=20):
+    """Meteor update and draw cost: Meteor sprites vs the MeteorField arrays."""
+    print(f"{'meteors':>8} {'store':>8} {'update (ms)':>12} {'+ draw (ms)':>12}")
+    for count in (1000, 10000, 30000):
+        if count <= 10000:  # Sprites get too slow to bother past this
+            world = game.World(0, headless=True)
+            spawn_meteors(count, world)
+            meteors = world.meteor_sprites
+            update = time_frames(lambda: meteors.update(DT), frames)
+            draw = time_frames(lambda: meteors.draw(game.display_surface), frames)
+            world.close()
+            print(f"{count:>8} {'sprites':>8} {update:>12.2f} {update + draw:>12.2f}")
+
+        field = game.MeteorField(game.meteor_surface)
+        for _ in range(count):
+            field.spawn((randint(0, game.RENDER_WIDTH), randint(0, game.RENDER_HEIGHT)))
+        field.born[:] = float('inf')  # Never expire, like spawn_meteors
+        field.velocity[:field.count] = 0
+        update = time_frames(lambda: field.update(DT), frames)
+        draw = time_frames(lambda: field.draw(game.display_surface), frames)
+        print(f"{count:>8} {'arrays':>8} {update:>12.2f} {update + draw:>12.2f}")
+
+
+def bench_collisions(backends=None, runs=3):
+    """Laser-meteor collision cost per backend, up to 1k lasers x 1k meteors."""
+    backends = backends or collision_backends()
+    # The last scene keeps lasers below most meteors, so few pairs actually hit
+    scenes = ((100, 100, 0), (1000, 100, 0), (1000, 1000, 0), (1000, 1000, 900))
+    print(f"{'lasers x meteors':>21} " + ' '.join(f"{b + ' (ms)':>19}" for b in backends))
+    for lasers, meteors, laser_top in scenes:
+        times = {backend: [] for backend in backends}
+        for seed in range(runs):
+            results = set()
+            for backend in backends:
+                elapsed, result = time_collisions(backend, lasers, meteors, seed, laser_top)
+                times[backend].append(elapsed)
+                results.add(result)
+            assert len(results) == 1, f"backends disagree: {results}"
+        row = ' '.join(f"{sum(t) / len(t):>19.2f}" for t in times.values())
+        label = f"{lasers} x {meteors}" + (" sparse" if laser_top else "")
+        print(f"{label:>21} {row}")
+    game.COLLISION_BACKEND = 'grid'
+
+
+def bench_fidelity(reps=20):
+    """Narrow-phase cost and hit count of each collision fidelity tier."""
+    center = (game.RENDER_WIDTH / 2, game.RENDER_HEIGHT / 2)
+    world = make_scene(300, 300, 0, player_pos=center)
+    player, meteor_sprites, laser_sprites = world.player, world.meteor_sprites, world.laser_sprites
+    # Every rect-overlapping pair, i.e. what a broad phase hands the narrow phase
+    pairs = [
+        (sprite, meteor)
+        for sprite in (player, *laser_sprites)
+        for meteor in meteor_sprites
+        if sprite.rect.colliderect(meteor.rect)
+    ]
+
+    timings = {}
+    print(f"{len(pairs)} candidate pairs")
+    print(f"{'tier':>10} {'us/pair':>8} {'hits':>5} {'vs mask':>8}")
+    for tier in ('mask', 'circle', 'aabb'):
+        collided = game.COLLIDERS[tier] or (lambda a, b: a.rect.colliderect(b.rect))
+        start = time.perf_counter()
+        for _ in range(reps):
+            hits = sum(1 for a, b in pairs if collided(a, b))
+        timings[tier] = (time.perf_counter() - start) * 1e6 / (reps * len(pairs))
+        print(f"{tier:>10} {timings[tier]:>8.3f} {hits:>5} {timings['mask'] / timings[tier]:>7.1f}x")
+    world.close()
+
+
+def run_world(world, seconds, dt=DT):
+    """Step a headless world for `seconds`, firing whenever it can, until game over."""
+    for _ in range(round(seconds / dt)):
+        if world.game_over:
+            break
+        world.player.fire_queued = True
+        world.advance(dt)
+    return world.score, world.game_over, round(world.time, 6)
+
+
+def bench_worlds(count=32, seconds=10):
+    """Many independent headless worlds in one process, and seeded replays."""
+    worlds = [game.World(seed, headless=True) for seed in range(count)]
+    start = time.perf_counter()
+    results = [run_world(world, seconds) for world in worlds]
+    elapsed = time.perf_counter() - start
+    simulated = sum(result[2] for result in results)
+    print(f"{count} worlds, {simulated:.0f} s simulated in {elapsed:.2f} s "
+          f"({simulated / elapsed:.0f}x real time)")
+    print(f"{sum(result[1] for result in results)} games over, scores "
+          f"{min(r[0] for r in results)}..{max(r[0] for r in results)}")
+
+    # Same seed, same game, even with the other worlds' sprites in the pools
+    for seed in (0, count - 1):
+        world = game.World(seed, headless=True)
+        replay = run_world(world, seconds)
+        world.close()
+        assert replay == results[seed], f"seed {seed}: replay {replay}, first run {results[seed]}"
+    print("seeded replays match")
+    for world in worlds:
+        world.close()
+
+
+def bench_batching(frames=20, repeats=9):
+    """World draw cost with per-sprite blits vs fblits batches grouped by image."""
+    # name, lasers, meteors, explosions, extra stars
+    scenes = (
+        ('typical', 5, 10, 2, 0),
+        ('busy', 100, 150, 20, 0),
+        ('heavy', 1000, 600, 100, 0),
+        ('stars', 0, 0, 0, 3000),  # Many tiny sprites: call overhead, not fill rate
+    )
+    print(f"{'scene':>8} {'sprites':>8} {'blits (ms)':>11} {'fblits (ms)':>12} {'speedup':>8}")
+    default = game.BATCHED_DRAW
+    for name, lasers, meteors, explosions, stars in scenes:
+        world = draw_scene(lasers, meteors, explosions)
+        for _ in range(stars):
+            game.Star(world, game.star_surface)
+
+        def draw(batched):
+            game.BATCHED_DRAW = batched
+            world.draw(game.display_surface)
+
+        timings = interleaved_medians([lambda: draw(False), lambda: draw(True)], frames, repeats)
+        print(f"{name:>8} {len(world.all_sprites):>8} {timings[0]:>11.3f} {timings[1]:>12.3f} "
+              f"{timings[0] / timings[1]:>7.2f}x")
+        world.close()
+    game.BATCHED_DRAW = default
+
+
+def bench_premultiplied(frames=30, repeats=9):
+    """
+    Per-frame blit cost of the sprite images three ways: plain per-pixel
+    alpha, as the game stores them (see OPTIMIZE_SURFACES), and premultiplied
+    blitted with BLEND_PREMULTIPLIED, plus how far the premultiplied frame
+    comes out from the stored one. Premultiplied images cannot use the
+    cheaper stored formats, so the default path is the one to beat.
+    PREMULTIPLIED_ALPHA only applies at load time, so the copies are made here.
+    """
+    # name, lasers, meteors, explosions
+    scenes = (('typical', 5, 10, 2), ('busy', 100, 150, 20), ('heavy', 1000, 600, 100))
+    targets = [pygame.Surface(game.display_surface.get_size()).convert() for _ in range(3)]
+    print(f"{'scene':>8} {'sprites':>8} {'alpha (ms)':>11} {'stored (ms)':>12} {'premul (ms)':>12} "
+          f"{'vs alpha':>9} {'vs stored':>10} {'max diff':>9}")
+    for name, lasers, meteors, explosions in scenes:
+        world = draw_scene(lasers, meteors, explosions)
+        sprites = world.all_sprites.sprites()
+        plain, premultiplied = {}, {}
+        for sprite in sprites:
+            if sprite.image not in plain:
+                # Per-pixel alpha without the stored format's colorkey or RLE
+                plain[sprite.image] = sprite.image.convert_alpha()
+                plain[sprite.image].set_alpha(255)  # Drops any RLEACCEL request
+                premultiplied[sprite.image] = plain[sprite.image].premul_alpha()
+        batches = (
+            [(plain[sprite.image], sprite.rect) for sprite in sprites],
+            [(sprite.image, sprite.rect) for sprite in sprites],
+            [(premultiplied[sprite.image], sprite.rect, None, pygame.BLEND_PREMULTIPLIED)
+             for sprite in sprites],
+        )
+
+        def draw(mode):
+            targets[mode].fill(game.BACKGROUND_COLOR)
+            targets[mode].blits(batches[mode], doreturn=False)
+
+        alpha, stored, premul = interleaved_medians(
+            [lambda mode=mode: draw(mode) for mode in range(3)], frames, repeats
+        )
+        # Premultiplying rounds each channel, so expect a level or two of difference
+        stored_bytes, premul_bytes = (pygame.image.tobytes(target, 'RGB') for target in targets[1:])
+        diff = max(abs(a - b) for a, b in zip(stored_bytes, premul_bytes))
+        print(f"{name:>8} {len(sprites):>8} {alpha:>11.3f} {stored:>12.3f} {premul:>12.3f} "
+              f"{alpha / premul:>8.2f}x {stored / premul:>9.2f}x {diff:>9}")
+        world.close()
+
+
+def bench_formats(blits=500, repeats=7):
+    """
+    Which SURFACE_FORMATS entry each asset gets, and the blit cost of every
+    format that draws the same as the original ('-' for those that do not).
+    """
+    assets = [
+        ('player', pygame.transform.scale_by(game.player_image, 1.2)),
+        ('star', game.load_image('images', 'star.png')),
+        ('laser', game.laser_surface),
+        ('meteor', game.meteor_surface),
+        ('meteor 45deg', pygame.transform.rotate(game.meteor_surface, 45)),
+        *((f"explosion {i}", game.load_image('images', 'explosion', f"{i}.png")) for i in (0, 5, 10, 15)),
+        ('title', game.title_font.render("SpaceShooties", True, (240, 240, 240)).convert_alpha()),
+    ]
+    target = pygame.Surface(game.display_surface.get_size()).convert()
+    width, height = target.get_size()
+    print(f"{'asset':>13} {'size':>8} {'chosen':>9}"
+          + ''.join(f" {name + ' (us)':>14}" for name in game.SURFACE_FORMATS))
+    for name, image in assets:
+        positions = [(randint(0, width - image.get_width()), randint(0, height - image.get_height()))
+                     for _ in range(blits)]
+        options = {format_name: build(image) for format_name, build in game.SURFACE_FORMATS.items()}
+        usable = [format_name for format_name, surface in options.items()
+                  if game.looks_same(image, surface)]
+        batches = [[(options[format_name], pos) for pos in positions] for format_name in usable]
+        timings = interleaved_medians(
+            [lambda batch=batch: target.blits(batch, doreturn=False) for batch in batches], 1, repeats
+        )
+        blit_us = {format_name: ms * 1000 / blits for format_name, ms in zip(usable, timings)}
+        cells = ''.join(
+            f" {blit_us[format_name]:>14.2f}" if format_name in blit_us else f" {'-':>14}"
+            for format_name in game.SURFACE_FORMATS
+        )
+        size = f"{image.get_width()}x{image.get_height()}"
+        print(f"{name:>13} {size:>8} {game.surface_format(image)[0]:>9}{cells}")
+
+
+def bench_stars(frames=120, repeats=15):
+    """
+    Per-frame cost (update and draw) of the old 20 Star sprites vs the
+    parallax Starfield of STAR_LAYERS, drawn with pixel writes and fblits, and
+    through the 'texture' renderer's layer and star textures.
+    """
+    default = game.STARFIELD
+    game.STARFIELD = 'sprites'
+    world = game.World(0, headless=True)
+    game.STARFIELD = default
+    world.player.kill()
+    sprites = world.all_sprites
+    field = game.Starfield(game.star_surface, rng=random.Random(0))
+    surface = game.display_surface
+
+    def draw_sprites():
+        sprites.update(DT)
+        sprites.draw(surface)
+
+    def draw_field():
+        field.update(DT)
+        field.draw(surface)
+
+    cases = [('20 Star sprites', len(sprites), draw_sprites),
+             ('Starfield', len(field), draw_field)]
+    if game.sdl2_video is not None:
+        renderer = game.TextureRenderer(surface)
+
+        def draw_field_texture():
+            field.update(DT)
+            renderer.draw_stars(field)
+
+        cases.append(('Starfield, texture', len(field), draw_field_texture))
+    timings = interleaved_medians([step for _, _, step in cases], frames, repeats)
+    print(f"{'background':>19} {'stars':>6} {'frame (us)':>11}")
+    for frame, (name, count, _) in zip(timings, cases):
+        print(f"{name:>19} {count:>6} {frame * 1000:>11.1f}")
+    world.close()
+
+
+def bench_nebula(frames=120, repeats=9, speeds=(15, 60, 240)):
+    """
+    Per-frame background cost of a plain fill vs the scrolling Nebula
+    (follow() and a full blit) at a few scroll speeds, plus the one-off cost
+    of building a screen of it and of composing one new row.
+    """
+    surface = game.display_surface
+    size = surface.get_size()
+    start = time.perf_counter()
+    game.Nebula(size)
+    build = time.perf_counter() - start
+
+    def fill():
+        surface.fill(game.BACKGROUND_COLOR)
+
+    cases = [('fill', fill)]
+    for speed in speeds:
+        nebula = game.Nebula(size, speed=speed)
+        clock = [0.0]
+
+        def scroll(nebula=nebula, clock=clock):
+            clock[0] += DT
+            nebula.follow(clock[0])
+            surface.blit(nebula.surface, (0, 0))
+
+        cases.append((f'nebula {speed} px/s', scroll))
+    row = [nebula.top]
+
+    def compose():
+        row[0] += 1
+        nebula.compose(row[0])
+
+    timings = interleaved_medians([step for _, step in cases], frames, repeats)
+    print(f"{'background':>19} {'frame (ms)':>11}")
+    for frame, (name, _) in zip(timings, cases):
+        print(f"{name:>19} {frame:>11.2f}")
+    print(f"build {size[0]}x{size[1]}: {build * 1000:.0f} ms, "
+          f"one new row: {time_frames(compose, frames) * 1000:.0f} us")
+
+
+def bench_present(frames=120):
+    """
+    Frame cost of each renderer, and how much of it is display.update(), over
+    a flat background (star sprites on the fill, the 'dirty' default) and a
+    rich one (Starfield and nebula). The clock moves, so the nebula scrolls.
+    The 'texture' renderer presents through SDL's renderer instead, so its
+    present cost is part of its frame time.
+    """
+    present = pygame.display.update
+    present_time = [0.0]
+
+    def timed_present(*args):
+        start = time.perf_counter()
+        present(*args)
+        present_time[0] += time.perf_counter() - start
+
+    # name, lasers, meteors: light is a quiet moment, heavy a crowded screen
+    scenes = (('light', 3, 5), ('medium', 20, 60), ('heavy', 200, 400))
+    # name, STARFIELD, USE_NEBULA
+    backgrounds = [('flat', 'sprites', False)]
+    if game.np is not None:
+        backgrounds.append(('rich', 'parallax', True))
+    defaults = game.STARFIELD, game.USE_NEBULA
+    center = (game.RENDER_WIDTH / 2, game.RENDER_HEIGHT / 2)
+    print(f"{'scene':>7} {'renderer':>9} {'background':>11} {'frame (ms)':>11} "
+          f"{'present (ms)':>13} {'full frames':>12}")
+    pygame.display.update = timed_present
+    try:
+        for name, lasers, meteors in scenes:
+            for renderer_name, Renderer in game.RENDERERS.items():
+                if renderer_name == 'texture' and game.sdl2_video is None:
+                    continue
+                for background, game.STARFIELD, game.USE_NEBULA in backgrounds:
+                    world = make_scene(lasers, 0, 0, laser_top=game.RENDER_HEIGHT / 2, player_pos=center)
+                    spawn_meteors(meteors, world)
+                    renderer = Renderer(game.display_surface)
+                    present_time[0] = 0.0
+
+                    def step():
+                        # Fires meteor spawns too; the scene's own meteors outlast the run
+                        world.timers.advance(DT)
+                        if game.STARFIELD == 'parallax':
+                            world.stars.update(DT)
+                        world.all_sprites.update(DT)
+                        renderer.render(world)
+
+                    frame = time_frames(step, frames)
+                    if renderer_name == 'texture':
+                        present_ms, full = '-', '-'
+                    else:
+                        present_ms = f"{present_time[0] * 1000 / frames:.3f}"
+                        full = getattr(renderer, 'full_frames', frames)
+                    print(f"{name:>7} {renderer_name:>9} {background:>11} {frame:>11.3f} "
+                          f"{present_ms:>13} {full:>12}")
+                    world.close()
+    finally:
+        pygame.display.update = present
+        game.STARFIELD, game.USE_NEBULA = defaults
+
+
+def bench_text(repeats=9):
+    """Text rendering: TTF Font.render vs the glyph atlas, and building vs loading atlases."""
+    path = os.path.join('images', 'Oxanium-Bold.ttf')
+    texts = ("Score: 0", "Score: 12340", "Press R to Restart")
+    print(f"{'size':>5} {'text':>20} {'TTF (us)':>9} {'atlas (us)':>11} {'same pixels':>12}")
+    for size in (40, 80):
+        font = pygame.font.Font(path, size)
+        atlas = game.GlyphAtlas(path, size, cache_dir=None)
+        for text in texts:
+            ttf = statistics.median(
+                time_frames(lambda: font.render(text, True, (240, 240, 240)), 200)
+                for _ in range(repeats)
+            )
+            composed = statistics.median(
+                time_frames(lambda: atlas.render(text, True, (240, 240, 240)), 200)
+                for _ in range(repeats)
+            )
+            same = (pygame.image.tobytes(font.render(text, True, (240, 240, 240)), 'RGBA')
+                    == pygame.image.tobytes(atlas.render(text, True, (240, 240, 240)), 'RGBA'))
+            print(f"{size:>5} {text:>20} {ttf * 1000:>9.1f} {composed * 1000:>11.1f} {str(same):>12}")
+
+    # Startup: rasterizing every glyph vs loading the atlas cached on disk
+    for size in (40, 80):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            start = time.perf_counter()
+            game.GlyphAtlas(path, size, cache_dir)
+            built = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            game.GlyphAtlas(path, size, cache_dir)
+            loaded = (time.perf_counter() - start) * 1000
+        print(f"size {size}: build {built:.1f} ms, load from cache {loaded:.1f} ms")
+
+
+def bench_resolution(frames=30, repeats=5):
+    """
+    Frame cost at lower internal resolutions: clear, draw a busy scene with
+    pre-scaled sprites, then transform.scale up into a window-sized surface.
+    RENDER_SCALE only applies at startup, so the scaling is redone here.
+    """
+    window_size = (game.WINDOW_WIDTH, game.WINDOW_HEIGHT)
+    window = pygame.Surface(window_size).convert()
+    world = draw_scene(100, 150, 0)
+    sprites = world.all_sprites.sprites()
+    print(f"{'internal size':>14} {'draw (ms)':>10} {'upscale (ms)':>13} {'total (ms)':>11}")
+    for scale in (1, 2 / 3, 1 / 2):
+        target = pygame.Surface((round(window_size[0] * scale), round(window_size[1] * scale))).convert()
+        images = {}
+        for sprite in sprites:
+            if sprite.image not in images:
+                images[sprite.image] = pygame.transform.smoothscale_by(sprite.image, scale)
+        batch = [(images[sprite.image], (sprite.rect.x * scale, sprite.rect.y * scale))
+                 for sprite in sprites]
+
+        def draw():
+            target.fill(game.BACKGROUND_COLOR)
+            target.blits(batch, doreturn=False)
+
+        draw_ms = statistics.median(time_frames(draw, frames) for _ in range(repeats))
+        upscale_ms = 0.0
+        if scale != 1:
+            upscale_ms = statistics.median(
+                time_frames(lambda: pygame.transform.scale(target, window_size, window), frames)
+                for _ in range(repeats)
+            )
+        label = f"{target.get_width()}x{target.get_height()}"
+        print(f"{label:>14} {draw_ms:>10.2f} {upscale_ms:>13.2f} {draw_ms + upscale_ms:>11.2f}")
+    world.close()
+
+
+BENCHMARKS = {
+    'rotation': bench_rotation,
+    'meteors': bench_meteors,
+    'groups': bench_groups,
+    'collisions': bench_collisions,
+    'fidelity': bench_fidelity,
+    'worlds': bench_worlds,
+    'present': bench_present,
+    'batching': bench_batching,
+    'text': bench_text,
+    'resolution': bench_resolution,
+    'premultiplied': bench_premultiplied,
+    'formats': bench_formats,
+    'stars': bench_stars,
+    'nebula': bench_nebula,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
+    pygame.quit()
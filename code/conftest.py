@@ -0,0 +1,62 @@
+"""
+Shared setup for the tests and benchmarks of SpaceShooties: a headless SDL,
+and the scene builders both use. pytest loads it before the test modules;
+benchmark.py imports it.
+
+Run from the project root so the asset paths resolve.
+"""
+
+import os
+import sys
+
+# Run without a real window or audio device
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# game.py loads the music at import, but the file is not in the repository
+MUSIC = os.path.join('audio', 'game_music.wav')
+if not os.path.exists(MUSIC):
+    sys.exit(f"{MUSIC} not found. Run from the project root, with a WAV file at {MUSIC} "
+             "(the game loads it at import, and it is not in the repository).")
+
+import game
+
+
+def collision_backends():
+    """All collision backends usable in this environment."""
+    backends = ['spritecollide', 'grid', 'sap']
+    if game.np is not None:
+        backends += ['numpy', 'field']
+    return backends
+
+
+def make_scene(lasers, meteors, seed, laser_top=0, player_pos=(-1000, -1000)):
+    """
+    Build a reproducible collision scene in a new headless World.
+    Lasers are placed at or below `laser_top`; meteors anywhere on screen.
+    The player is parked off-screen unless `player_pos` says otherwise.
+    """
+    world = game.World(seed, headless=True)
+    rng = world.rng
+    world.player.rect.center = player_pos
+    for _ in range(meteors):
+        pos = (rng.uniform(0, game.RENDER_WIDTH), rng.uniform(0, game.RENDER_HEIGHT))
+        meteor = game.Meteor(game.meteor_surface, pos, world)
+        meteor.rotation = rng.uniform(0, 360)
+        game.rotation_cache.get(meteor.original_image, meteor.rotation).apply(meteor)
+        meteor.rect = meteor.image.get_frect(center=pos)
+    for _ in range(lasers):
+        pos = (rng.uniform(0, game.RENDER_WIDTH), rng.uniform(laser_top, game.RENDER_HEIGHT))
+        game.Laser(game.laser_surface, pos, world)
+    return world
+
+
+def to_field(meteor_sprites):
+    """Move every meteor sprite into a new MeteorField, keeping position, path and angle."""
+    field = game.MeteorField(game.meteor_surface)
+    for meteor in meteor_sprites:
+        field.spawn(meteor.rect.center)
+        field.previous[field.count - 1] = meteor.previous_center
+        field.angle[field.count - 1] = meteor.rotation
+        meteor.kill()
+    return field
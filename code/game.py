@@ -1,7 +1,21 @@
+import hashlib
+import json
+import math
+import os
 import pygame
+import random
 import sys
-from os.path import join
-from random import randint, uniform
+from os.path import basename, join, splitext
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the array-backed options need it
+    np = None
+
+try:
+    from pygame._sdl2 import video as sdl2_video
+except ImportError:  # Only the 'texture' renderer needs pygame's SDL2 video module
+    sdl2_video = None
 
 ###############################################################################
 #                               GLOBAL CONSTANTS                              #
@@ -9,32 +23,218 @@ from random import randint, uniform
 
 WINDOW_WIDTH = 1920
 WINDOW_HEIGHT = 1080
+# Internal render resolution as a fraction of the window, e.g. 0.5 for 960x540.
+# The game is laid out and drawn at this size, then upscaled to the window.
+RENDER_SCALE = 1
+RENDER_WIDTH = round(WINDOW_WIDTH * RENDER_SCALE)
+RENDER_HEIGHT = round(WINDOW_HEIGHT * RENDER_SCALE)
+# 'transform' (transform.scale into the window surface) or 'scaled' (pygame.SCALED)
+UPSCALE = 'transform'
 FPS = 60  # Frames per second
+SIMULATION_RATE = None  # Fixed simulation steps per second, None = one step per frame
+MAX_SIMULATION_STEPS = 5  # Most fixed steps run in one frame before the sim slows down
+TIMER_RESOLUTION = 0.01  # Seconds per timer wheel tick
+METEOR_SPAWN_INTERVAL = 0.5  # Seconds between meteor spawns
+
+# Meteor rotation
+ROTATION_STEP = 2  # Degrees between pre-rotated meteor frames
+USE_ROTATION_CACHE = True  # False rotates meteors with transform.rotate every frame
+
+# 'sprites' (one Meteor sprite each) or 'arrays' (one MeteorField, needs NumPy)
+METEOR_STORE = 'sprites'
+USE_ENTITY_GROUPS = True  # False uses pygame.sprite.Group for the sprite groups (no draw culling)
+BATCHED_DRAW = False  # EntityGroups draw with fblits, grouped by image (see benchmark.py)
+# Premultiply image alpha at load time and blit with BLEND_PREMULTIPLIED. Cheaper than
+# plain alpha blits, but it rules out the OPTIMIZE_SURFACES formats and ends up
+# slower than the default (see benchmark.py premultiplied)
+PREMULTIPLIED_ALPHA = False
+# Store each sprite image in the cheapest format that draws the same (see benchmark.py formats)
+OPTIMIZE_SURFACES = True
+RLE_TRANSLUCENT_LIMIT = 0.5  # Largest share of translucent pixels still worth RLE-encoding
+COLORKEY = (255, 0, 255)  # Transparent color of images stored with a colorkey
+
+# Collisions
+# 'grid' (spatial hash), 'sap' (sweep and prune), 'numpy' (batched, needs NumPy)
+# or 'spritecollide' (brute force)
+COLLISION_BACKEND = 'grid'
+GRID_CELL_SIZE = 128  # Spatial hash cell size in pixels, roughly one meteor across
+SWEPT_COLLISIONS = False  # Test the path lasers and meteors travelled during a step
+
+# Narrow-phase test per collision pair, cheapest to most exact: 'aabb',
+# 'circle' (rects and bounding circles) or 'mask' (pixel masks). Each tier
+# only narrows the one before, so a hit always needs the rects to overlap
+# and every backend finds the same hits.
+# Swept laser collisions always use their own AABB test.
+COLLISION_FIDELITY = {
+    'player_meteor': 'mask',
+    'laser_meteor': 'aabb',
+}
+
+# Rendering
+BACKGROUND_COLOR = (58, 46, 63)  # '#3a2e3f'
+# 'full' (redraw and present the whole screen), 'dirty' (only what changed)
+# or 'texture' (SDL's 2D renderer, drawing uploaded textures)
+RENDERER = 'full'
+DIRTY_AREA_THRESHOLD = 0.5  # Screen fraction past which 'dirty' redraws everything
+ACCELERATED_RENDERER = True  # False forces SDL's software renderer for 'texture' (no GPU)
+
+# Scrolling nebula behind the stars (see benchmark.py nebula); False fills BACKGROUND_COLOR.
+# 'dirty' has to redraw the whole screen on every frame the nebula scrolls.
+USE_NEBULA = RENDERER != 'dirty'
+NEBULA_SPEED = 15  # Scroll speed in window pixels per second
+# Noise octaves, coarse to fine: (cell size in window pixels, opacity)
+NEBULA_OCTAVES = ((480, 1), (160, 0.5), (40, 0.2))
+NEBULA_TINTS = ((104, 58, 128), (52, 72, 120), (128, 62, 96))  # Cloud colors, over BACKGROUND_COLOR
+NEBULA_DENSITY = 0.6  # Strongest tint a cloud cell gets, 0 to 1
+
+# Background stars: 'parallax' (a Starfield of STAR_LAYERS, needs NumPy) or
+# 'sprites' (20 Star sprites). The Starfield moves all over the screen every
+# frame, which would turn every 'dirty' frame into a full redraw.
+STARFIELD = 'parallax' if np is not None and RENDERER != 'dirty' else 'sprites'
+# Starfield layers, far to near: (stars, speed, size, brightness), speed and size
+# in window pixels. Size 1 stars are single pixels, drawn under the larger ones.
+STAR_LAYERS = (
+    (900, 25, 1, 0.3),
+    (400, 60, 1, 0.55),
+    (150, 120, 1, 0.85),
+    (12, 200, 16, 0.8),
+    (4, 300, 50, 1),
+)
+
+# Text
+USE_GLYPH_ATLAS = False  # Compose text from pre-rasterized glyphs (see benchmark.py text)
+GLYPH_CACHE_DIR = join('cache', 'glyphs')  # Where glyph atlases are kept between runs, or None
 
 ###############################################################################
 #                               INITIAL SETUP                                 #
 ###############################################################################
 
+def px(length):
+    """Convert a length given in window pixels (layout, speeds) to render pixels."""
+    return round(length * RENDER_SCALE)
+
+def load_image(*path):
+    """
+    Load an image, pre-scaled to the internal render resolution and, with
+    PREMULTIPLIED_ALPHA, premultiplied. Scaling comes first: smoothscale
+    filters straight alpha.
+    """
+    image = pygame.image.load(join(*path)).convert_alpha()
+    if RENDER_SCALE != 1:
+        image = pygame.transform.smoothscale_by(image, RENDER_SCALE)
+    if PREMULTIPLIED_ALPHA:
+        image = image.premul_alpha()
+    return image
+
+def blend_flags():
+    """The special_flags every image is blitted with: premultiplied or plain alpha."""
+    return pygame.BLEND_PREMULTIPLIED if PREMULTIPLIED_ALPHA else 0
+
+def to_colorkey(image):
+    """`image` without per-pixel alpha, its transparent pixels set to COLORKEY."""
+    surface = pygame.Surface(image.get_size()).convert()
+    surface.fill(COLORKEY)
+    surface.blit(image, (0, 0))
+    surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return surface
+
+def to_rle(image):
+    """A copy of `image` whose alpha SDL run-length encodes on its first blit."""
+    surface = image.copy()
+    surface.set_alpha(255, pygame.RLEACCEL)
+    return surface
+
+# Ways to store an image, cheapest to blit first
+SURFACE_FORMATS = {
+    'opaque': lambda image: image.convert(),  # Every pixel opaque: a plain copy
+    'colorkey': to_colorkey,  # Pixels fully opaque or fully transparent
+    'rle': to_rle,  # Runs of transparent and opaque pixels are skipped or copied whole
+    'alpha': lambda image: image,  # Per-pixel alpha, as loaded
+}
+
+def looks_same(image, surface):
+    """
+    Whether `surface` draws like `image` over both a dark and a light
+    background. SDL's RLE blitter rounds differently, so one level off is
+    allowed in each channel.
+    """
+    size = image.get_size()
+    for background in (BACKGROUND_COLOR, (255, 255, 255)):
+        drawn = []
+        for source in (image, surface):
+            target = pygame.Surface(size).convert()
+            target.fill(background)
+            target.blit(source, (0, 0))
+            drawn.append(target)
+        # |a - b| per channel, as subtraction clamps at 0
+        difference, reverse = drawn[0].copy(), drawn[1]
+        difference.blit(drawn[1], (0, 0), special_flags=pygame.BLEND_SUB)
+        reverse.blit(drawn[0], (0, 0), special_flags=pygame.BLEND_SUB)
+        difference.blit(reverse, (0, 0), special_flags=pygame.BLEND_ADD)
+        if pygame.mask.from_threshold(difference, (0, 0, 0), (2, 2, 2, 255)).count() < size[0] * size[1]:
+            return False
+    return True
+
+def surface_format(image):
+    """
+    Pick the cheapest SURFACE_FORMATS entry for `image` from its alpha
+    content, checked with looks_same(). Returns (format name, surface).
+    """
+    area = image.get_width() * image.get_height()
+    visible = pygame.mask.from_surface(image, 0).count()
+    opaque = pygame.mask.from_surface(image, 254).count()
+    names = []
+    if opaque == area:
+        names.append('opaque')
+    elif visible == opaque:
+        names.append('colorkey')
+    if visible - opaque <= RLE_TRANSLUCENT_LIMIT * area:
+        names.append('rle')
+    for name in names:
+        surface = SURFACE_FORMATS[name](image)
+        if looks_same(image, surface):
+            return name, surface
+    return 'alpha', image
+
+def optimize_surface(image):
+    """
+    `image` in the cheapest format that draws the same, with OPTIMIZE_SURFACES.
+    Only for images that are blitted as they are: transforming or reading the
+    pixels of an RLE surface decodes it. Premultiplied images need their alpha
+    blend, so they stay as they are.
+    """
+    if not OPTIMIZE_SURFACES or PREMULTIPLIED_ALPHA:
+        return image
+    return surface_format(image)[1]
+
+
 pygame.init()
-display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+# Everything draws onto display_surface, which window_surface shows upscaled
+if RENDER_SCALE == 1:
+    display_surface = window_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+elif UPSCALE == 'scaled':
+    # SDL stretches the display surface to fit the window by itself
+    display_surface = window_surface = pygame.display.set_mode(
+        (RENDER_WIDTH, RENDER_HEIGHT), pygame.SCALED
+    )
+else:
+    window_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    display_surface = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT)).convert()
 pygame.display.set_caption('SpaceShooties')
 clock = pygame.time.Clock()
 
 # Load font
-font = pygame.font.Font(join('images', 'Oxanium-Bold.ttf'), 40)
-game_font = pygame.font.Font(join('images', 'Oxanium-Bold.ttf'), 80)
+font = pygame.font.Font(join('images', 'Oxanium-Bold.ttf'), px(40))
+game_font = pygame.font.Font(join('images', 'Oxanium-Bold.ttf'), px(80))
 
 # Load images
-player_image = pygame.image.load(join('images', 'player.png')).convert_alpha()
-star_surface = pygame.image.load(join('images', 'star.png')).convert_alpha()
-laser_surface = pygame.image.load(join('images', 'laser.png')).convert_alpha()
-meteor_surface = pygame.image.load(join('images', 'meteor.png')).convert_alpha()
+player_image = load_image('images', 'player.png')
+star_surface = optimize_surface(load_image('images', 'star.png'))
+laser_surface = load_image('images', 'laser.png')
+meteor_surface = load_image('images', 'meteor.png')
 
 # Load explosion frames
-explosion_frames = [
-    pygame.image.load(join('images','explosion', f"{i}.png")).convert_alpha()
-    for i in range(21)
-]
+explosion_frames = [optimize_surface(load_image('images', 'explosion', f"{i}.png")) for i in range(21)]
 
 # Load sounds
 laser_sound = pygame.mixer.Sound(join('audio','laser.wav'))
@@ -46,9 +246,636 @@ game_music.set_volume(0.4)
 game_over_music = pygame.mixer.Sound(join('audio', 'No_Hope.wav'))
 game_over_music.set_volume(0.8)
 
-# Custom event for meteor spawn
-METEOR_EVENT = pygame.event.custom_type()
-pygame.time.set_timer(METEOR_EVENT, 500)
+
+###############################################################################
+#                                 GLYPH ATLAS                                 #
+###############################################################################
+
+class GlyphAtlas:
+    """
+    Every printable ASCII character of a TTF font pre-rasterized into one
+    surface, so a string is composed with a single fblits call instead of a
+    TTF layout and rasterization. Stands in for Font.render(), with the same
+    pixels, as pygame does not kern. The atlas is cached in `cache_dir`, so
+    later startups load it instead of rasterizing.
+    """
+
+    CHARACTERS = ''.join(map(chr, range(32, 127)))
+
+    def __init__(self, path, size, cache_dir=GLYPH_CACHE_DIR):
+        with open(path, 'rb') as file:
+            font_hash = hashlib.sha1(file.read()).hexdigest()
+        # Anything that changes the pixels invalidates the cached atlas
+        self.key = {'font': font_hash, 'size': size, 'characters': self.CHARACTERS,
+                    'pygame': pygame.version.ver}
+        self.cache_path = None
+        if cache_dir is not None:
+            self.cache_path = join(cache_dir, f"{splitext(basename(path))[0]}-{size}")
+
+        loaded = self.load()
+        self.atlas, self.rects = loaded if loaded else self.build(path, size)
+        self.height = self.atlas.get_height()
+        self.tinted = {}  # Color -> glyph subsurfaces of an atlas copy in that colour
+
+    def build(self, path, size):
+        """Rasterize the glyphs into a new atlas, one row wide, and cache it."""
+        font = pygame.font.Font(path, size)
+        glyphs = [font.render(char, True, (255, 255, 255)) for char in self.CHARACTERS]
+        atlas = pygame.Surface((sum(glyph.get_width() for glyph in glyphs),
+                                max(glyph.get_height() for glyph in glyphs)), pygame.SRCALPHA)
+        rects = {}
+        x = 0
+        for char, glyph in zip(self.CHARACTERS, glyphs):
+            rects[char] = atlas.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += glyph.get_width()
+
+        if self.cache_path is not None:
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                pygame.image.save(atlas, self.cache_path + '.png')
+                with open(self.cache_path + '.json', 'w') as file:
+                    json.dump({'key': self.key,
+                               'glyphs': {char: tuple(rect) for char, rect in rects.items()}}, file)
+            except OSError:
+                pass  # No writable cache: rasterize again next time
+        return atlas.convert_alpha(), rects
+
+    def load(self):
+        """The cached (atlas, glyph rects), or None if missing or stale."""
+        if self.cache_path is None:
+            return None
+        try:
+            with open(self.cache_path + '.json') as file:
+                index = json.load(file)
+            if index['key'] != self.key:
+                return None
+            atlas = pygame.image.load(self.cache_path + '.png').convert_alpha()
+        except (OSError, ValueError, KeyError, pygame.error):
+            return None
+        return atlas, {char: pygame.Rect(rect) for char, rect in index['glyphs'].items()}
+
+    def glyphs(self, color):
+        """Each character's glyph in `color`, tinting the atlas on first use."""
+        color = tuple(pygame.Color(color))
+        glyphs = self.tinted.get(color)
+        if glyphs is None:
+            # The atlas is white, so multiplying by the colour tints it exactly
+            atlas = self.atlas.copy()
+            atlas.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+            glyphs = self.tinted[color] = {
+                char: atlas.subsurface(rect) for char, rect in self.rects.items()
+            }
+        return glyphs
+
+    def render(self, text, antialias=True, color=(255, 255, 255)):
+        """Like Font.render(); glyphs are always antialiased. Unknown characters show as '?'."""
+        glyphs = self.glyphs(color)
+        batch = []
+        x = 0
+        for char in text:
+            glyph = glyphs.get(char) or glyphs['?']
+            batch.append((glyph, (x, 0)))
+            x += glyph.get_width()
+        surface = pygame.Surface((x, self.height), pygame.SRCALPHA)
+        surface.fblits(batch, pygame.BLEND_RGBA_MAX)  # Copies glyph pixels as they are
+        return surface
+
+
+if USE_GLYPH_ATLAS:
+    hud_font = GlyphAtlas(join('images', 'Oxanium-Bold.ttf'), px(40))
+    title_font = GlyphAtlas(join('images', 'Oxanium-Bold.ttf'), px(80))
+else:
+    hud_font, title_font = font, game_font
+title_surface = title_font.render("SpaceShooties", True, (240, 240, 240)).convert_alpha()
+if PREMULTIPLIED_ALPHA:
+    title_surface = title_surface.premul_alpha()
+title_surface = optimize_surface(title_surface)
+
+
+###############################################################################
+#                          SPRITE FRAMES & ROTATION CACHE                     #
+###############################################################################
+
+class SpriteFrame:
+    """
+    An image bundled with its collision mask and bounding radius.
+    With `optimize`, the image drawn is stored by optimize_surface().
+    """
+
+    __slots__ = ('image', 'mask', 'radius')
+
+    def __init__(self, image, optimize=False):
+        self.image = optimize_surface(image) if optimize else image
+        self.mask = pygame.mask.from_surface(image)
+        self.radius = bounding_radius(self.mask)
+
+    def apply(self, sprite):
+        """Show this frame on `sprite`, along with its collision data."""
+        sprite.image = self.image
+        sprite.mask = self.mask
+        sprite.radius = self.radius
+
+
+def bounding_radius(mask):
+    """Distance from the mask centre to the furthest corner of its opaque area."""
+    rects = mask.get_bounding_rects()
+    if not rects:
+        return 0
+    box = rects[0].unionall(rects[1:])
+    cx, cy = mask.get_size()[0] / 2, mask.get_size()[1] / 2
+    return max(
+        math.hypot(x - cx, y - cy)
+        for x, y in (box.topleft, box.topright, box.bottomleft, box.bottomright)
+    )
+
+
+class RotationCache:
+    """Pre-rotated frames of source surfaces, shared by every sprite using them."""
+
+    def __init__(self, step=ROTATION_STEP):
+        self.count = max(1, round(360 / step))
+        self.step = 360 / self.count
+        self._frames = {}
+
+    def frames(self, surface):
+        """Return all rotated frames of `surface`, building them on first use."""
+        frames = self._frames.get(surface)
+        if frames is None:
+            frames = [
+                SpriteFrame(pygame.transform.rotate(surface, i * self.step), optimize=True)
+                for i in range(self.count)
+            ]
+            self._frames[surface] = frames
+        return frames
+
+    def get(self, surface, angle):
+        """Return the frame of `surface` closest to `angle` (in degrees)."""
+        return self.frames(surface)[round(angle / self.step) % self.count]
+
+
+rotation_cache = RotationCache()
+_static_frames = {}
+
+
+def static_frame(surface):
+    """The shared SpriteFrame of an unrotated `surface`, built on first use."""
+    frame = _static_frames.get(surface)
+    if frame is None:
+        frame = _static_frames[surface] = SpriteFrame(surface, optimize=True)
+    return frame
+
+
+###############################################################################
+#                              SWEPT COLLISIONS                               #
+###############################################################################
+
+def swept_bounds(sprite):
+    """Rect covering `sprite` both where it started and where it ended the step."""
+    rect = sprite.rect
+    start_x, start_y = sprite.previous_center
+    return rect.union(rect.move(start_x - rect.centerx, start_y - rect.centery))
+
+
+def broad_rect(sprite):
+    """Rect the broad phases should bucket `sprite` by."""
+    return swept_bounds(sprite) if SWEPT_COLLISIONS else sprite.rect
+
+
+def collide_swept(left, right):
+    """
+    True if the rects of `left` and `right` overlapped at any time during the
+    last step, assuming both moved in a straight line from previous_center.
+    Fast, thin sprites can no longer pass through each other between steps.
+    """
+    # Work relative to `right`: only the difference in motion matters
+    start_x = left.previous_center[0] - right.previous_center[0]
+    start_y = left.previous_center[1] - right.previous_center[1]
+    move_x = left.rect.centerx - right.rect.centerx - start_x
+    move_y = left.rect.centery - right.rect.centery - start_y
+    half_width = (left.rect.width + right.rect.width) / 2
+    half_height = (left.rect.height + right.rect.height) / 2
+
+    # Slab test: find the time window (within the step) where both axes overlap
+    enter, leave = 0.0, 1.0
+    for start, move, half in ((start_x, move_x, half_width), (start_y, move_y, half_height)):
+        if move == 0:
+            if abs(start) >= half:
+                return False
+            continue
+        t0, t1 = (-half - start) / move, (half - start) / move
+        enter, leave = max(enter, min(t0, t1)), min(leave, max(t0, t1))
+        if enter >= leave:
+            return False
+    return True
+
+
+###############################################################################
+#                                   CULLING                                   #
+###############################################################################
+
+def on_screen(rect):
+    """True if `rect` overlaps the play area."""
+    return (rect.right > 0 and rect.left < RENDER_WIDTH
+            and rect.bottom > 0 and rect.top < RENDER_HEIGHT)
+
+
+def left_play_area(rect, drift_x):
+    """
+    True once `rect`, falling with horizontal drift `drift_x`, can never come
+    (back) into view: below the screen, or off a side and drifting away.
+    """
+    return (rect.top > RENDER_HEIGHT
+            or (rect.right < 0 and drift_x <= 0)
+            or (rect.left > RENDER_WIDTH and drift_x >= 0))
+
+
+###############################################################################
+#                                 SPATIAL HASH                                #
+###############################################################################
+
+class SpatialHash:
+    """Uniform grid that buckets sprites by the cells their rect overlaps."""
+
+    def __init__(self, cell_size=GRID_CELL_SIZE, bounds=broad_rect):
+        self.cell_size = cell_size
+        self.bounds = bounds  # sprite -> rect to bucket it by
+        self.cells = {}  # (column, row) -> set of sprites
+        self.spans = {}  # sprite -> (left, top, right, bottom) cell span
+
+    def _span(self, rect):
+        size = self.cell_size
+        return (int(rect.left // size), int(rect.top // size),
+                int(rect.right // size), int(rect.bottom // size))
+
+    def _cells(self, span):
+        left, top, right, bottom = span
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                yield column, row
+
+    def insert(self, sprite):
+        """Add `sprite` to every cell its rect overlaps."""
+        span = self._span(self.bounds(sprite))
+        self.spans[sprite] = span
+        for cell in self._cells(span):
+            self.cells.setdefault(cell, set()).add(sprite)
+
+    def remove(self, sprite):
+        """Take `sprite` out of the grid if it is in it."""
+        span = self.spans.pop(sprite, None)
+        if span is None:
+            return
+        for cell in self._cells(span):
+            bucket = self.cells[cell]
+            bucket.discard(sprite)
+            if not bucket:
+                del self.cells[cell]
+
+    def sync(self, sprites):
+        """
+        Bring the grid in line with the `sprites` group.
+        Only sprites that moved to a different cell span are re-bucketed,
+        and sprites no longer in the group are dropped.
+        """
+        for sprite in [s for s in self.spans if s not in sprites]:
+            self.remove(sprite)
+        for sprite in sprites:
+            if self.spans.get(sprite) != self._span(self.bounds(sprite)):
+                self.remove(sprite)
+                self.insert(sprite)
+
+    def query(self, rect):
+        """Return the set of sprites sharing at least one cell with `rect`."""
+        found = set()
+        cells = self.cells
+        for cell in self._cells(self._span(rect)):
+            bucket = cells.get(cell)
+            if bucket:
+                found |= bucket
+        return found
+
+    def spritecollide(self, sprite, dokill, collided=None):
+        """Grid-backed equivalent of pygame.sprite.spritecollide."""
+        candidates = self.query(self.bounds(sprite))
+        if collided is None:
+            colliderect = sprite.rect.colliderect
+            hits = [other for other in candidates if colliderect(other.rect)]
+        else:
+            hits = [other for other in candidates if collided(sprite, other)]
+        if dokill:
+            for other in hits:
+                self.remove(other)
+                other.kill()
+        return hits
+
+
+
+###############################################################################
+#                               SWEEP AND PRUNE                               #
+###############################################################################
+
+class SweepAndPrune:
+    """
+    Broad phase keeping every collider in a single list sorted by rect.left.
+    Positions barely change between frames, so the list stays nearly sorted
+    and an insertion sort brings it back in order in close to linear time.
+    """
+
+    def __init__(self, bounds=broad_rect):
+        self.bounds = bounds  # sprite -> rect to sort and overlap by
+        self.entries = []
+        self.members = set()
+
+    def sync(self, sprites):
+        """Track exactly `sprites` and re-sort them by their left edge."""
+        current = set(sprites)
+        entries = [s for s in self.entries if s in current]
+        entries.extend(s for s in sprites if s not in self.members)
+        self.members = current
+
+        lefts = [self.bounds(s).left for s in entries]
+        for i in range(1, len(entries)):
+            sprite, left = entries[i], lefts[i]
+            j = i - 1
+            while j >= 0 and lefts[j] > left:
+                entries[j + 1], lefts[j + 1] = entries[j], lefts[j]
+                j -= 1
+            entries[j + 1], lefts[j + 1] = sprite, left
+        self.entries = entries
+
+    def pairs(self):
+        """Yield every pair of tracked sprites whose rects overlap."""
+        active = []
+        for sprite in self.entries:
+            rect = self.bounds(sprite)
+            left = rect.left
+            active = [(other, other_rect) for other, other_rect in active
+                      if other_rect.right > left]
+            for other, other_rect in active:
+                if rect.colliderect(other_rect):
+                    yield other, sprite
+            active.append((sprite, rect))
+
+
+
+###############################################################################
+#                                 TIMER WHEEL                                 #
+###############################################################################
+
+class Timer:
+    """A callback scheduled on a TimerWheel."""
+
+    __slots__ = ('due', 'interval', 'callback', 'args', 'cancelled')
+
+    def __init__(self, due, interval, callback, args):
+        self.due = due  # Wheel tick the timer fires on
+        self.interval = interval  # Seconds between repeats, None for one-shot
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop the timer from firing (again)."""
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel driven by simulation time.
+    Timers are bucketed by the tick they fire on, so advancing only looks at
+    the buckets of the ticks that passed: the cost per frame follows the
+    number of timers due, not the number of live entities.
+    """
+
+    def __init__(self, resolution=TIMER_RESOLUTION, slots=256):
+        self.resolution = resolution
+        self.slots = [[] for _ in range(slots)]
+        self.time = 0.0  # Simulation time in seconds
+        self.tick = 0  # Last tick processed
+
+    def schedule(self, delay, callback, *args, interval=None):
+        """Call callback(*args) once `delay` seconds from now. Returns the Timer."""
+        due = max(self.tick + 1, math.ceil((self.time + delay) / self.resolution))
+        timer = Timer(due, interval, callback, args)
+        self.slots[due % len(self.slots)].append(timer)
+        return timer
+
+    def schedule_every(self, interval, callback, *args):
+        """Call callback(*args) every `interval` seconds. Returns the Timer."""
+        return self.schedule(interval, callback, *args, interval=interval)
+
+    def advance(self, dt):
+        """Move simulation time forward by `dt` and fire every timer now due."""
+        self.time += dt
+        target = int(self.time / self.resolution)
+        slots = self.slots
+        while self.tick < target:
+            self.tick += 1
+            index = self.tick % len(slots)
+            bucket = slots[index]
+            if not bucket:
+                continue
+            # Timers for later laps around the wheel stay in the bucket
+            slots[index] = [timer for timer in bucket if timer.due > self.tick]
+            for timer in bucket:
+                if timer.due <= self.tick and not timer.cancelled:
+                    timer.callback(*timer.args)
+                    if timer.interval is not None and not timer.cancelled:
+                        timer.due = self.tick + max(1, round(timer.interval / self.resolution))
+                        slots[timer.due % len(slots)].append(timer)
+
+
+###############################################################################
+#                                OBJECT POOLS                                 #
+###############################################################################
+
+class Pool:
+    """Free list of PooledSprites, so frequent spawns reuse instead of allocate."""
+
+    def __init__(self, sprite_class):
+        self.sprite_class = sprite_class
+        self.free = []
+        self.in_use = 0
+        self.high_water = 0  # Most sprites ever in use at once
+
+    def acquire(self, *args):
+        """Return a sprite set up with `args`, recycled if one is free."""
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+        else:
+            sprite = self.sprite_class(*args)
+            sprite.pool = self
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return sprite
+
+    def release(self, sprite):
+        """Take back a killed sprite for later reuse."""
+        self.in_use -= 1
+        self.free.append(sprite)
+
+
+class PooledSprite(pygame.sprite.Sprite):
+    """
+    Sprite that a Pool can recycle: set up in reset(), handed back by its
+    world once killed (see World.retire()).
+    """
+
+    # Slots keep the attributes touched every frame out of the instance dict
+    __slots__ = ('pool', 'expiry', 'world', 'image', 'rect', 'mask', 'radius', 'previous_center',
+                 'all_index', 'group_index')  # The last two for EntityGroup
+
+    def __init__(self, *args):
+        super().__init__()
+        self.pool = None  # The Pool this sprite returns to when killed, if any
+        self.expiry = None  # Timer that kills the sprite, if any
+        self.world = None  # The World the sprite currently belongs to
+        self.rect = None
+        self.reset(*args)
+
+    def reset(self, *args):
+        """(Re)initialise the sprite exactly as a fresh one would be, in `world` (last arg)."""
+        raise NotImplementedError
+
+    def place(self, **anchor):
+        """Fit self.rect to self.image at `anchor`, reusing the FRect if there is one."""
+        if self.rect is None:
+            self.rect = self.image.get_frect(**anchor)
+        else:
+            self.rect.size = self.image.get_size()
+            for name, value in anchor.items():
+                setattr(self.rect, name, value)
+
+    def expire_in(self, seconds):
+        """Have the world's timer wheel kill the sprite `seconds` from now."""
+        self.expiry = self.world.timers.schedule(seconds, self.kill)
+
+    def kill(self):
+        """Remove the sprite from all groups and retire it for its pool."""
+        if self.expiry is not None:
+            self.expiry.cancel()
+            self.expiry = None
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.world.retire(self)
+
+
+###############################################################################
+#                                ENTITY GROUP                                 #
+###############################################################################
+
+class EntityGroup:
+    """
+    Lightweight stand-in for pygame.sprite.Group in the hot paths.
+    Sprites live in one flat list; removal swaps the last sprite into the gap,
+    so add and remove are O(1), and update()/draw() walk the list in place
+    instead of copying it first. Iterating the group still yields a copy, so
+    sprites may be killed while looping over it.
+
+    Each sprite keeps its position in the list in the attribute named by
+    `index` (a slot on PooledSprite), so groups a sprite can be in at the
+    same time need different `index` names.
+    """
+
+    _spritegroup = True  # Lets Sprite.add()/kill() treat this as a group
+    __slots__ = ('_sprites', '_index')
+
+    def __init__(self, *sprites, index='group_index'):
+        self._sprites = []
+        self._index = index  # Name of the sprite attribute holding its position
+        self.add(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        setattr(sprite, self._index, len(self._sprites))
+        self._sprites.append(sprite)
+
+    def remove_internal(self, sprite):
+        i = getattr(sprite, self._index)
+        last = self._sprites.pop()
+        if last is not sprite:
+            self._sprites[i] = last
+            setattr(last, self._index, i)
+
+    def has_internal(self, sprite):
+        # The attribute is stale once the sprite leaves, so check the list too
+        i = getattr(sprite, self._index, None)
+        return i is not None and i < len(self._sprites) and self._sprites[i] is sprite
+
+    def add(self, *sprites):
+        """Add sprites that are not already in the group."""
+        for sprite in sprites:
+            if not self.has_internal(sprite):
+                self.add_internal(sprite)
+                sprite.add_internal(self)
+
+    def remove(self, *sprites):
+        """Remove sprites that are in the group."""
+        for sprite in sprites:
+            if self.has_internal(sprite):
+                self.remove_internal(sprite)
+                sprite.remove_internal(self)
+
+    def sprites(self):
+        """Return a list copy of the sprites in the group."""
+        return list(self._sprites)
+
+    def empty(self):
+        """Remove every sprite from the group."""
+        self.remove(*self._sprites)
+
+    def __iter__(self):
+        return iter(list(self._sprites))
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def __bool__(self):
+        return bool(self._sprites)
+
+    __contains__ = has_internal
+
+    def update(self, *args, **kwargs):
+        """
+        Call update() on every sprite. Walking backwards means a sprite that
+        kills itself only swaps in one that was already updated, and sprites
+        added during the walk wait for the next frame, as with Group.
+        """
+        for sprite in reversed(self._sprites):
+            sprite.update(*args, **kwargs)
+
+    def draw(self, surface, rects=None):
+        """
+        Blit every sprite overlapping `surface` in one call, and return how
+        many that was. The screen area each blit touched is added to `rects`,
+        if given.
+
+        With BATCHED_DRAW (and no `rects`, which fblits cannot report) the
+        blits go out through fblits, grouped by source image: all stars, all
+        lasers, all meteors on the same rotation frame and so on back to back.
+        Images are layered in the order they first appear in the group.
+        """
+        overlaps = surface.get_rect().colliderect
+        flags = blend_flags()
+        if BATCHED_DRAW and rects is None:
+            by_image = {}
+            for sprite in self._sprites:
+                if overlaps(sprite.rect):
+                    by_image.setdefault(sprite.image, []).append(sprite.rect)
+            batch = [(image, rect) for image, image_rects in by_image.items() for rect in image_rects]
+            surface.fblits(batch, flags)
+        else:
+            if flags:
+                batch = [(sprite.image, sprite.rect, None, flags)
+                         for sprite in self._sprites if overlaps(sprite.rect)]
+            else:
+                batch = [(sprite.image, sprite.rect) for sprite in self._sprites if overlaps(sprite.rect)]
+            if rects is None:
+                surface.blits(batch, doreturn=False)
+            else:
+                rects.extend(surface.blits(batch))
+        return len(batch)
 
 
 ###############################################################################
@@ -58,177 +885,1302 @@ pygame.time.set_timer(METEOR_EVENT, 500)
 class Player(pygame.sprite.Sprite):
     """The player-controlled spaceship."""
 
-    def __init__(self, groups):
-        super().__init__(groups)
-        self.image = pygame.transform.scale_by(player_image, 1.2)
-        self.rect = self.image.get_frect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2))
+    def __init__(self, world):
+        super().__init__(world.all_sprites)
+        self.world = world
+        SpriteFrame(pygame.transform.scale_by(player_image, 1.2), optimize=True).apply(self)
+        self.rect = self.image.get_frect(center=(RENDER_WIDTH / 2, RENDER_HEIGHT / 2))
+        self.previous_center = self.rect.center
         self.direction = pygame.Vector2()
-        self.speed = 500
+        self.speed = px(500)
+        self.fire_queued = False  # Set by run_game when SPACE is pressed
+        # Headless worlds read no keyboard: drive self.direction directly
 
         # Laser cooldown
         self.can_shoot = True
-        self.laser_shoot_time = 0
         self.COOLDOWN_DURATION = 400
 
-    def laser_timer(self):
-        """Check and update laser cooldown."""
-        if not self.can_shoot:
-            current_time = pygame.time.get_ticks()
-            if current_time - self.laser_shoot_time >= self.COOLDOWN_DURATION:
-                self.can_shoot = True
+    def reload(self):
+        """End the laser cooldown (called by the timer wheel)."""
+        self.can_shoot = True
 
     def update(self, dt):
         """Update the player's movement and handle laser firing."""
-        keys = pygame.key.get_pressed()
-        self.direction.x = int(keys[pygame.K_RIGHT]) - int(keys[pygame.K_LEFT])
-        self.direction.y = int(keys[pygame.K_DOWN]) - int(keys[pygame.K_UP])
+        if not self.world.headless:
+            keys = pygame.key.get_pressed()
+            self.direction.x = int(keys[pygame.K_RIGHT]) - int(keys[pygame.K_LEFT])
+            self.direction.y = int(keys[pygame.K_DOWN]) - int(keys[pygame.K_UP])
         self.direction = self.direction.normalize() if self.direction.length() != 0 else self.direction
 
         # Move player
+        self.previous_center = self.rect.center
         self.rect.center += self.direction * self.speed * dt
 
         # Check for laser firing
-        recent_keys = pygame.key.get_just_pressed()
-        if recent_keys[pygame.K_SPACE] and self.can_shoot:
-            Laser(laser_surface, self.rect.midtop, (all_sprites, laser_sprites))
-            laser_sound.play()
+        if self.fire_queued and self.can_shoot:
+            laser_pool.acquire(laser_surface, self.rect.midtop, self.world)
+            if not self.world.headless:
+                laser_sound.play()
             self.can_shoot = False
-            self.laser_shoot_time = pygame.time.get_ticks()
-
-        self.laser_timer()
+            self.world.timers.schedule(self.COOLDOWN_DURATION / 1000, self.reload)
+        self.fire_queued = False
 
 class Star(pygame.sprite.Sprite):
     """Background stars that continuously move downward."""
 
-    def __init__(self, groups, surf):
-        super().__init__(groups)
+    def __init__(self, world, surf):
+        super().__init__(world.all_sprites)
+        self.world = world
         self.image = surf
-        self.speed = 300
+        self.speed = px(300)
         self.rect = self.image.get_frect(
-            center=(randint(0, WINDOW_WIDTH), randint(0, WINDOW_HEIGHT))
+            center=(world.rng.randint(0, RENDER_WIDTH), world.rng.randint(0, RENDER_HEIGHT))
         )
 
     def update(self, dt):
         """Move the star downward and wrap back to top."""
         self.rect.centery += self.speed * dt
-        if self.rect.top >= WINDOW_HEIGHT:
+        if self.rect.top >= RENDER_HEIGHT:
             self.rect.top = 0
-            self.rect.centerx = randint(0, WINDOW_WIDTH)
+            self.rect.centerx = self.world.rng.randint(0, RENDER_WIDTH)
 
-class Laser(pygame.sprite.Sprite):
+class Laser(PooledSprite):
     """Player-fired laser that moves upward."""
 
-    def __init__(self, surface, position, groups):
-        super().__init__(groups)
-        self.image = surface
-        self.rect = self.image.get_frect(midbottom=position)
+    __slots__ = ()
+
+    SPEED = px(400)
+
+    def reset(self, surface, position, world):
+        self.world = world
+        static_frame(surface).apply(self)
+        self.place(midbottom=position)
+        self.previous_center = self.rect.center
+        self.add(world.all_sprites, world.laser_sprites)
 
     def update(self, dt):
         """Move laser upward and remove it if it goes off-screen."""
-        self.rect.centery -= 400 * dt
+        self.previous_center = self.rect.center
+        self.rect.centery -= self.SPEED * dt
         if self.rect.bottom < 0:
             self.kill()
 
-class Meteor(pygame.sprite.Sprite):
+class Meteor(PooledSprite):
     """Randomly spawned meteors that move downward at an angle."""
 
-    def __init__(self, surface, position, groups):
-        super().__init__(groups)
+    __slots__ = ('original_image', 'speed', 'direction', 'rotation', 'rotation_speed')
+
+    LIFETIME = 3000  # ms
+
+    def __init__(self, surface, position, world):
+        self.direction = pygame.Vector2()  # Reused across resets
+        super().__init__(surface, position, world)
+
+    def reset(self, surface, position, world):
+        self.world = world
         self.original_image = surface
-        self.image = self.original_image
-        self.rect = self.image.get_frect(center=position)
-        self.speed = randint(400, 600)
-        self.direction = pygame.Vector2(uniform(-0.5, 0.5), 1)
+        rotation_cache.get(surface, 0).apply(self)
+        self.place(center=position)
+        self.previous_center = self.rect.center
+        self.speed = px(world.rng.randint(400, 600))
+        self.direction.update(world.rng.uniform(-0.5, 0.5), 1)
 
         # Rotation
         self.rotation = 0
-        self.rotation_speed = randint(40, 80)
+        self.rotation_speed = world.rng.randint(40, 80)
 
         # Lifetime (meteor is destroyed automatically after 3s)
-        self.spawn_time = pygame.time.get_ticks()
-        self.LIFETIME = 3000  # ms
+        self.expire_in(self.LIFETIME / 1000)
+        self.add(world.all_sprites, world.meteor_sprites)
 
     def update(self, dt):
-        """Move and rotate the meteor, and remove it after lifetime."""
+        """Move and rotate the meteor, despawning it once it is gone for good."""
+        self.previous_center = self.rect.center
         self.rect.center += self.speed * self.direction * dt
+        if left_play_area(self.rect, self.direction.x):
+            self.world.cull_stats['despawned'] += 1
+            self.kill()
+            return
 
-        # Rotate meteors
+        # Rotate meteors, but only bother with a new frame while on screen
         self.rotation += self.rotation_speed * dt
-        self.image = pygame.transform.rotate(self.original_image, self.rotation)
-        self.rect = self.image.get_frect(center=self.rect.center)
+        if not on_screen(self.rect):
+            self.world.cull_stats['offscreen'] += 1
+        elif USE_ROTATION_CACHE:
+            center = self.rect.center
+            rotation_cache.get(self.original_image, self.rotation).apply(self)
+            self.rect.size = self.image.get_size()
+            self.rect.center = center
+        else:
+            self.image = pygame.transform.rotate(self.original_image, self.rotation)
+            self.rect = self.image.get_frect(center=self.rect.center)
+            # The radius from reset() still bounds the meteor at any angle, so
+            # only the 'mask' tier needs collision data rebuilt for the new image
+            if 'mask' in COLLISION_FIDELITY.values():
+                self.mask = pygame.mask.from_surface(self.image)
+
+class AnimatedExplosion(PooledSprite):
+    """Animated explosion that plays frames and destroys itself after finishing."""
 
-        # Remove meteor after lifetime
-        if pygame.time.get_ticks() - self.spawn_time >= self.LIFETIME:
-            self.kill()
+    __slots__ = ('frames', 'frame_index')
 
-class AnimatedExplosion(pygame.sprite.Sprite):
-    """Animated explosion that plays frames and destroys itself after finishing."""
+    FRAME_RATE = 30  # Animation frames per second
 
-    def __init__(self, frames, pos, groups):
-        super().__init__(groups)
+    def reset(self, frames, pos, world):
+        self.world = world
         self.frames = frames
         self.frame_index = 0
         self.image = self.frames[self.frame_index]
-        self.rect = self.image.get_frect(center=pos)
+        self.place(center=pos)
+        self.expire_in(len(frames) / self.FRAME_RATE)
+        self.add(world.all_sprites)
 
     def update(self, dt):
         """Animate the explosion by cycling through frames."""
-        self.frame_index += 30 * dt
-        if int(self.frame_index) < len(self.frames):
-            self.image = self.frames[int(self.frame_index)]
+        self.frame_index += self.FRAME_RATE * dt
+        self.image = self.frames[min(int(self.frame_index), len(self.frames) - 1)]
+
+
+laser_pool = Pool(Laser)
+meteor_pool = Pool(Meteor)
+explosion_pool = Pool(AnimatedExplosion)
+
+
+def pool_stats():
+    """Telemetry for the sprite pools: name -> (in use, free, high-water mark)."""
+    return {
+        name: (pool.in_use, len(pool.free), pool.high_water)
+        for name, pool in (('laser', laser_pool), ('meteor', meteor_pool),
+                           ('explosion', explosion_pool))
+    }
+
+
+###############################################################################
+#                                METEOR FIELD                                 #
+###############################################################################
+
+class MeteorView:
+    """Sprite-like stand-in for one MeteorField entry, for the narrow-phase tests."""
+
+    __slots__ = ('image', 'mask', 'radius', 'rect', 'previous_center')
+
+    def __init__(self, frame, center, previous_center):
+        frame.apply(self)
+        self.rect = self.image.get_frect(center=center)
+        self.previous_center = previous_center
+
+
+class MeteorField:
+    """
+    Every meteor in one struct-of-arrays store, advanced by a single vectorized
+    step instead of one Sprite.update call per meteor. Offers update(dt),
+    draw(surface) and len() so it can stand in for the meteor_sprites group.
+    """
+
+    LIFETIME = 3  # seconds, like Meteor.LIFETIME
+    _ARRAYS = ('position', 'previous', 'velocity', 'angle', 'spin', 'born')
+
+    def __init__(self, surface, rng=None, capacity=256):
+        if np is None:
+            raise RuntimeError("MeteorField requires NumPy")
+        self.frames = rotation_cache.frames(surface)
+        self.images = [frame.image for frame in self.frames]
+        self.half_sizes = np.array([image.get_size() for image in self.images], dtype=float) / 2
+        self.radii = np.array([frame.radius for frame in self.frames], dtype=float)
+        self.rng = rng if rng is not None else random.Random()
+        self.time = 0.0  # Simulation time in seconds
+        self.count = 0
+
+        self.position = np.empty((capacity, 2))
+        self.previous = np.empty((capacity, 2))  # Position before the last update
+        self.velocity = np.empty((capacity, 2))
+        self.angle = np.empty(capacity)
+        self.spin = np.empty(capacity)  # Degrees per second
+        self.born = np.empty(capacity)  # Simulation time of the spawn
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, position):
+        """Add a meteor at `position`, moving and spinning like a Meteor would."""
+        if self.count == len(self.born):
+            for name in self._ARRAYS:
+                array = getattr(self, name)
+                grown = np.empty((2 * len(array),) + array.shape[1:])
+                grown[:self.count] = array
+                setattr(self, name, grown)
+
+        i = self.count
+        speed = px(self.rng.randint(400, 600))
+        self.position[i] = self.previous[i] = position
+        self.velocity[i] = (self.rng.uniform(-0.5, 0.5) * speed, speed)
+        self.angle[i] = 0
+        self.spin[i] = self.rng.randint(40, 80)
+        self.born[i] = self.time
+        self.count += 1
+
+    def update(self, dt):
+        """
+        Move and rotate every meteor, then drop those past their lifetime or
+        that can never come into view again (see left_play_area()).
+        Returns the number dropped for the second reason.
+        """
+        n = self.count
+        self.previous[:n] = self.position[:n]
+        self.position[:n] += self.velocity[:n] * dt
+        self.angle[:n] += self.spin[:n] * dt
+        self.time += dt
+
+        x, y = self.position[:n].T
+        drift = self.velocity[:n, 0]
+        half_width, half_height = self.half_sizes.max(axis=0)  # Any rotation fits
+        gone = ((y - half_height > RENDER_HEIGHT)
+                | ((x + half_width < 0) & (drift <= 0))
+                | ((x - half_width > RENDER_WIDTH) & (drift >= 0)))
+        self.remove(gone | (self.time - self.born[:n] >= self.LIFETIME))
+        return int(gone.sum())
+
+    def remove(self, dead):
+        """Drop every meteor flagged in the boolean array `dead`."""
+        if not dead.any():
+            return
+        keep = ~dead
+        n = self.count
+        for name in self._ARRAYS:
+            array = getattr(self, name)
+            kept = array[:n][keep]
+            array[:len(kept)] = kept
+        self.count = len(kept)
+
+    def frame_indices(self):
+        """Index into self.frames of each meteor's current rotation."""
+        step = rotation_cache.step
+        return np.rint(self.angle[:self.count] / step).astype(int) % len(self.frames)
+
+    def rects(self, indices):
+        """Left, top, right and bottom arrays of every meteor's rect."""
+        half = self.half_sizes[indices]
+        position = self.position[:self.count]
+        top_left = position - half
+        bottom_right = position + half
+        return top_left[:, 0], top_left[:, 1], bottom_right[:, 0], bottom_right[:, 1]
+
+    def view(self, i, indices):
+        """A MeteorView of meteor `i`, given the frame_indices() result."""
+        return MeteorView(self.frames[indices[i]], tuple(self.position[i]), tuple(self.previous[i]))
+
+    def draw(self, surface, rects=None):
+        """
+        Blit every meteor overlapping `surface` with a single fblits call, and
+        return how many that was. The screen area each blit touched is added
+        to `rects`, if given.
+        """
+        indices = self.frame_indices()
+        left, top, right, bottom = self.rects(indices)
+        width, height = surface.get_size()
+        visible = (right > 0) & (left < width) & (bottom > 0) & (top < height)
+        images = self.images
+        flags = blend_flags()
+        batch = [
+            (images[i], (x, y))
+            for i, x, y in zip(indices[visible].tolist(),
+                               left[visible].tolist(), top[visible].tolist())
+        ]
+        if rects is None:
+            surface.fblits(batch, flags)
         else:
-            self.kill()
+            # fblits does not report the areas
+            rects.extend(surface.blits([(image, pos, None, flags) for image, pos in batch]))
+        return len(batch)
+
+
+###############################################################################
+#                                  STARFIELD                                  #
+###############################################################################
+
+class Starfield:
+    """
+    The background stars as parallax layers (see STAR_LAYERS) in one
+    struct-of-arrays store. Single-pixel stars scroll down with their layer,
+    wrapping around, and are written straight into the target's pixels in
+    one go. Larger stars are `surface` scaled down, moved by one vectorized
+    step, re-enter at a random column once past the bottom, and are blitted
+    with one fblits call.
+    """
+
+    def __init__(self, surface, layers=STAR_LAYERS, rng=None):
+        if np is None:
+            raise RuntimeError("Starfield requires NumPy")
+        rng = rng if rng is not None else random.Random()
+        self.rng = np.random.default_rng(rng.getrandbits(64))  # Follows the world's seed
+        self.time = 0.0  # Seconds scrolled so far
+        dot_layers = [layer for layer in layers if layer[2] == 1]
+        image_layers = [layer for layer in layers if layer[2] != 1]
+
+        # Pixel stars: a fixed column and starting row, sorted by row within
+        # each layer so the writes sweep through memory in order
+        self.dots = []  # (slice of the pixel star arrays, color) of each layer
+        columns, rows = [], []
+        for count, _, _, brightness in dot_layers:
+            color = pygame.Color(BACKGROUND_COLOR).lerp('white', brightness)
+            self.dots.append((slice(len(rows), len(rows) + count), color))
+            columns.extend(self.rng.integers(0, RENDER_WIDTH, count))
+            rows.extend(np.sort(self.rng.integers(0, RENDER_HEIGHT, count)))
+        self.column = np.array(columns, dtype=np.intp)
+        self.start_row = np.array(rows, dtype=np.intp)
+        self.dot_speeds = np.array([px(speed) for _, speed, _, _ in dot_layers], dtype=float)
+        self.dot_layer = np.repeat(np.arange(len(dot_layers)), [count for count, *_ in dot_layers])
+        self.pixel_format = None  # Pixel format of pixel_colors
+        self.pixel_colors = None  # Each pixel star's color, mapped to pixel_format
+
+        # Larger stars: top left corners, speeds and sizes
+        self.images = []  # (slice of the larger star arrays, image) of each layer
+        speeds, sizes = [], []
+        for count, speed, size, brightness in image_layers:
+            self.images.append((slice(len(sizes), len(sizes) + count),
+                                star_image(surface, px(size), brightness)))
+            speeds.extend([px(speed)] * count)
+            sizes.extend([px(size)] * count)
+        self.speed = np.array(speeds, dtype=float)
+        self.size = np.array(sizes, dtype=float)
+        self.x = self.rng.uniform(0, RENDER_WIDTH, len(sizes)) - self.size / 2
+        self.y = self.rng.uniform(0, RENDER_HEIGHT, len(sizes)) - self.size / 2
+
+    def __len__(self):
+        return len(self.column) + len(self.x)
+
+    def update(self, dt):
+        """Scroll the pixel stars and move the larger ones down, wrapping them back above the top."""
+        self.time += dt
+        y = self.y
+        y += self.speed * dt
+        wrapped = np.flatnonzero(y >= RENDER_HEIGHT)
+        if len(wrapped):
+            size = self.size[wrapped]
+            y[wrapped] -= RENDER_HEIGHT + size
+            self.x[wrapped] = self.rng.uniform(0, RENDER_WIDTH, len(wrapped)) - size / 2
+
+    def offsets(self):
+        """How many rows each pixel star layer has scrolled down, wrapping around."""
+        return (self.dot_speeds * self.time).astype(np.intp) % RENDER_HEIGHT
+
+    def rows(self):
+        """The row each pixel star is on now."""
+        rows = self.offsets()[self.dot_layer]
+        rows += self.start_row
+        rows[rows >= RENDER_HEIGHT] -= RENDER_HEIGHT
+        return rows
+
+    def positions(self, layer):
+        """Top left corners of the larger stars in `layer`, a slice of their arrays."""
+        return zip(self.x[layer].tolist(), self.y[layer].tolist())
+
+    def draw(self, surface, rects=None):
+        """
+        Draw every star onto `surface`, which must be the render size, pixel
+        stars first. If `rects` is given, the whole of `surface` is added to
+        it: the stars move all over the screen every frame.
+        """
+        pixel_format = (surface.get_bitsize(), surface.get_masks())
+        if pixel_format != self.pixel_format:
+            colors = np.array([surface.map_rgb(color) for _, color in self.dots])
+            self.pixel_colors = colors[self.dot_layer]
+            self.pixel_format = pixel_format
+        x, y = self.column, self.rows()
+        pixels = pygame.surfarray.pixels2d(surface)
+        pixels[x, y] = self.pixel_colors
+        del pixels  # Unlocks the surface
+        surface.fblits([(image, position) for layer, image in self.images
+                        for position in self.positions(layer)], blend_flags())
+        if rects is not None:
+            rects.append(surface.get_rect())
+
+
+_star_images = {}
+
+
+def star_image(surface, size, brightness):
+    """`surface` scaled to `size` pixels across and faded to `brightness`, built on first use."""
+    key = (surface, size, brightness)
+    image = _star_images.get(key)
+    if image is None:
+        image = pygame.transform.smoothscale(surface, (size, size))
+        # Premultiplied pixels fade by scaling color along with alpha
+        alpha = round(255 * brightness)
+        fade = (alpha,) * 4 if PREMULTIPLIED_ALPHA else (255, 255, 255, alpha)
+        image.fill(fade, special_flags=pygame.BLEND_RGBA_MULT)
+        image = _star_images[key] = optimize_surface(image)
+    return image
+
+
+###############################################################################
+#                                   NEBULA                                    #
+###############################################################################
+
+class Nebula:
+    """
+    A scrolling cloud backdrop kept in a persistent surface. Each frame the
+    surface is moved down with Surface.scroll by the whole rows it travelled,
+    and only the strip scrolled into view at the top is generated. Rows come
+    from value noise: per octave, a line of random cells upscaled with
+    smoothscale, blended with the next line down the sky.
+    """
+
+    def __init__(self, size, speed=NEBULA_SPEED, octaves=NEBULA_OCTAVES, seed=0):
+        self.surface = pygame.Surface(size).convert()
+        self.speed = px(speed)
+        self.octaves = [(max(1, px(cell)), opacity) for cell, opacity in octaves]
+        self.seed = seed
+        self.time = 0.0  # Game time last followed
+        self.offset = 0.0  # Rows travelled but not yet scrolled
+        width, height = size
+        self.row = pygame.Surface((width, 1)).convert()  # Row being composed
+        self.layer = pygame.Surface((width, 1)).convert()  # One octave of it
+        self._lines = [[None, None, None] for _ in self.octaves]  # Cached lines j, j + 1
+
+        # Noise row of the top screen row; rows further down the screen are lower
+        self.top = height - 1
+        for y in range(height - 1, -1, -1):  # Up the sky, so the line cache only moves forward
+            self.surface.blit(self.compose(self.top - y), (0, y))
+
+    def line(self, octave, j):
+        """Cell line `j` of `octave`, upscaled to the surface width."""
+        cell, _ = self.octaves[octave]
+        width = self.surface.get_width()
+        rng = random.Random(hash((self.seed, octave, j)))
+        cells = pygame.Surface((width // cell + 2, 1)).convert()
+        base = pygame.Color(BACKGROUND_COLOR)
+        for i in range(cells.get_width()):
+            tint = pygame.Color(rng.choice(NEBULA_TINTS))
+            cells.set_at((i, 0), base.lerp(tint, NEBULA_DENSITY * rng.random() ** 2))
+        line = pygame.transform.smoothscale(cells, (cells.get_width() * cell, 1))
+        return line.subsurface((cell // 2, 0, width, 1))  # Skip the clamped half cell at the edge
+
+    def lines(self, octave, j):
+        """Cell lines `j` and `j + 1` of `octave`, built on first use."""
+        cached = self._lines[octave]
+        if cached[0] != j:
+            upper = cached[2] if cached[0] == j - 1 else self.line(octave, j)
+            cached[:] = [j, upper, self.line(octave, j + 1)]
+        return cached[1], cached[2]
+
+    def compose(self, index):
+        """Render noise row `index` into self.row and return it."""
+        for octave, (cell, opacity) in enumerate(self.octaves):
+            j, part = divmod(index, cell)
+            lower, upper = self.lines(octave, j)
+            self.layer.blit(lower, (0, 0))
+            upper.set_alpha(round(255 * part / cell))
+            self.layer.blit(upper, (0, 0))
+            self.layer.set_alpha(round(255 * opacity))
+            self.row.blit(self.layer, (0, 0))
+        return self.row
+
+    def follow(self, time):
+        """
+        Scroll to `time` seconds of game time, generating only the rows that
+        come into view. An earlier time (a new game) carries on from here.
+        Returns the number of rows scrolled.
+        """
+        elapsed = time - self.time if time >= self.time else time
+        self.time = time
+        self.offset += elapsed * self.speed
+        rows = int(self.offset)
+        if rows:
+            self.offset -= rows
+            self.top += rows
+            exposed = min(rows, self.surface.get_height())
+            self.surface.scroll(0, rows)
+            for y in range(exposed - 1, -1, -1):
+                self.surface.blit(self.compose(self.top - y), (0, y))
+        return rows
+
+
+###############################################################################
+#                              COLLISION EVENTS                               #
+###############################################################################
+
+class CollisionEvents:
+    """
+    Batch of everything collisions() found, for the consumers below to act on.
+    One batch can collect several simulation steps before being consumed.
+    """
+
+    __slots__ = ('player_hit', 'hit_positions', 'hit_counts', 'lasers', 'meteors')
+
+    def __init__(self):
+        self.player_hit = False
+        self.hit_positions = []  # Explosion position for each laser that hit
+        self.hit_counts = []  # Meteors destroyed by each of those lasers
+        self.lasers = []  # Lasers used up by hits
+        self.meteors = []  # Meteors destroyed by lasers
+
+    def clear(self):
+        """Empty the batch so it can be reused for the next frame."""
+        self.player_hit = False
+        self.hit_positions.clear()
+        self.hit_counts.clear()
+        self.lasers.clear()
+        self.meteors.clear()
+
+
+def play_collision_sounds(events):
+    """Play the explosion sound once for the batch, however many hits it holds."""
+    if events.hit_positions:
+        explosion_sound.play()
+
+def spawn_explosions(events, frames, world):
+    """Start an explosion animation in `world` at every hit position in the batch."""
+    for position in events.hit_positions:
+        explosion_pool.acquire(frames, position, world)
+
+def collision_score(events):
+    """Score earned by the batch: 10 points per meteor destroyed."""
+    return 10 * sum(events.hit_counts)
+
+
+###############################################################################
+#                                    WORLD                                    #
+###############################################################################
+
+class World:
+    """
+    One self-contained game: its sprite groups, player, score, RNG, simulation
+    clock and meteor spawn schedule. Entities are handed their world, never
+    reach for globals, so any number of worlds can run side by side in one
+    process. Headless worlds read no keyboard and make no sound or explosions.
+    """
+
+    def __init__(self, seed=None, headless=False):
+        self.rng = random.Random(seed)
+        self.headless = headless
+        self.timers = TimerWheel()  # Its time is the world's simulation clock
+
+        # Sprite groups
+        Group = EntityGroup if USE_ENTITY_GROUPS else pygame.sprite.Group
+        # Every sprite in laser_sprites or meteor_sprites is in all_sprites too
+        self.all_sprites = EntityGroup(index='all_index') if USE_ENTITY_GROUPS else Group()
+        self.laser_sprites = Group()
+        if METEOR_STORE == 'arrays':
+            self.meteor_sprites = MeteorField(meteor_surface, self.rng)
+        else:
+            self.meteor_sprites = Group()
+
+        # Broad-phase state, kept per world so worlds never see each other's sprites
+        self.meteor_grid = SpatialHash()
+        self.collision_sweep = SweepAndPrune()
+
+        # Work skipped by viewport culling during the current frame: counted
+        # by advance() and then draw() or the renderer, zeroed by advance()
+        self.cull_stats = {
+            'offscreen': 0,  # Meteors updated without rotating because they were off-screen
+            'despawned': 0,  # Meteors removed early because they can no longer come into view
+            'drawn': 0,  # Sprites blitted
+            'draw_culled': 0,  # Sprites skipped by draw() because they were off-screen
+        }
+
+        # Score and running state
+        self.events = CollisionEvents()  # Reused every frame
+        self.retired = []  # Pooled sprites killed since the batch was cleared
+        self.score = 0
+        self.game_over = False
+        self.unsimulated_time = 0  # Seconds not yet covered by fixed simulation steps
+
+        # Player, initial stars and meteor spawns
+        self.player = Player(self)
+        if STARFIELD == 'parallax':
+            self.stars = Starfield(star_surface, rng=self.rng)
+        else:
+            for _ in range(20):
+                Star(self, star_surface)
+        self.timers.schedule_every(METEOR_SPAWN_INTERVAL, self.spawn_meteor)
+
+    @property
+    def time(self):
+        """Simulation time in seconds."""
+        return self.timers.time
+
+    def retire(self, sprite):
+        """
+        Hold a killed pooled sprite until self.events is cleared. Released at
+        once, a later step of the same frame could reuse it for a new spawn
+        while the batch still names it as a hit.
+        """
+        self.retired.append(sprite)
+
+    def recycle(self):
+        """Hand every retired sprite back to its pool."""
+        for sprite in self.retired:
+            sprite.pool.release(sprite)
+        self.retired.clear()
+
+    def spawn_meteor(self):
+        """Drop a new meteor in somewhere above the screen."""
+        position = (self.rng.randint(0, RENDER_WIDTH), px(self.rng.randint(-200, -100)))
+        if METEOR_STORE == 'arrays':
+            self.meteor_sprites.spawn(position)
+        else:
+            meteor_pool.acquire(meteor_surface, position, self)
+
+    def step(self, dt):
+        """Run one simulation step of `dt` seconds, adding its hits to self.events."""
+        # Fire due timers: spawns, lifetimes and cooldowns
+        self.timers.advance(dt)
+
+        # Update sprites
+        if STARFIELD == 'parallax':
+            self.stars.update(dt)
+        self.all_sprites.update(dt)
+        if METEOR_STORE == 'arrays':
+            self.cull_stats['despawned'] += self.meteor_sprites.update(dt)
+
+        # Check collisions
+        collisions(self.player, self.meteor_sprites, self.laser_sprites, self.events,
+                   self.meteor_grid, self.collision_sweep)
+        if self.events.player_hit:
+            self.game_over = True
+
+    def advance(self, dt):
+        """
+        Simulate `dt` seconds of frame time, then apply the frame's hits.
+
+        Returns:
+            events (CollisionEvents): This frame's hits, for the caller's own
+            consumers (sounds, say). Reused by the next call, which is also
+            when the pooled sprites it names go back to their pools.
+        """
+        # One simulation step per frame, or as many fixed steps as fit in dt
+        steps, step_dt = 1, dt
+        if SIMULATION_RATE:
+            step_dt = 1 / SIMULATION_RATE
+            self.unsimulated_time = min(self.unsimulated_time + dt, MAX_SIMULATION_STEPS * step_dt)
+            steps = int(self.unsimulated_time / step_dt)
+            self.unsimulated_time -= steps * step_dt
+
+        self.recycle()
+        self.events.clear()
+        for key in self.cull_stats:
+            self.cull_stats[key] = 0
+        for _ in range(steps):
+            self.step(step_dt)
+            if self.game_over:
+                break
+
+        # React to this frame's hits in one pass per consumer
+        if not self.headless:
+            spawn_explosions(self.events, explosion_frames, self)
+        self.score += collision_score(self.events)
+        return self.events
+
+    def draw(self, surface, rects=None):
+        """
+        Draw the starfield, then every sprite (and the meteor field) onto
+        `surface`, counting them in self.cull_stats. The screen area of each
+        sprite drawn is added to `rects`, if given.
+        """
+        stats = self.cull_stats
+        if STARFIELD == 'parallax':
+            self.stars.draw(surface, rects)
+        if isinstance(self.all_sprites, EntityGroup):
+            drawn = self.all_sprites.draw(surface, rects)
+            stats['drawn'] += drawn
+            stats['draw_culled'] += len(self.all_sprites) - drawn
+        else:
+            # Group.draw does not cull: off-screen sprites are blitted too, clipped
+            self.all_sprites.draw(surface, special_flags=blend_flags())
+            stats['drawn'] += len(self.all_sprites)
+            if rects is not None:
+                rects.extend(self.all_sprites.spritedict.values())
+        if METEOR_STORE == 'arrays':
+            drawn = self.meteor_sprites.draw(surface, rects)
+            stats['drawn'] += drawn
+            stats['draw_culled'] += len(self.meteor_sprites) - drawn
+
+    def close(self):
+        """Kill every sprite, handing the pooled ones back to their pools."""
+        for sprite in self.all_sprites.sprites():
+            sprite.kill()
+        self.recycle()
+
+
+###############################################################################
+#                                  RENDERING                                  #
+###############################################################################
+
+class HudPanel:
+    """
+    One HUD readout: `template` filled in with a value, inside a rounded
+    border, placed by `anchor` like get_rect(). The panel is rendered into a
+    cached surface only when the value changes; otherwise drawing it is a
+    single blit.
+    """
+
+    def __init__(self, template, text_font=hud_font, color=(240, 240, 240), **anchor):
+        self.template = template
+        self.font = text_font
+        self.color = color
+        self.anchor = anchor
+        self.value = None
+        self.surface = None  # The rendered panel
+        self.rect = None  # Where the panel goes on screen
+
+    def update(self, value):
+        """Re-render the panel if `value` changed. Returns True if it did."""
+        if self.surface is not None and value == self.value:
+            return False
+        self.value = value
+        text_surface = self.font.render(self.template.format(value), True, self.color)
+        # Whole pixels, rounded the way blitting at the float position would
+        text_rect = pygame.Rect(text_surface.get_frect(**self.anchor))
+        border_rect = text_rect.inflate(px(20), px(10)).move(0, -px(8))
+        self.rect = border_rect.union(text_rect)
+
+        # MAX copies the text's pixels as they are instead of blending them
+        # with the transparent panel, which would darken the antialiasing
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(self.surface, self.color, border_rect.move(-self.rect.x, -self.rect.y),
+                         width=1, border_radius=px(10))
+        self.surface.blit(text_surface, text_rect.move(-self.rect.x, -self.rect.y),
+                          special_flags=pygame.BLEND_RGBA_MAX)
+        if PREMULTIPLIED_ALPHA:
+            self.surface = self.surface.premul_alpha()
+        return True
+
+    def draw(self, surface, value):
+        """Draw the panel showing `value` onto `surface`. Returns the area drawn."""
+        self.update(value)
+        return surface.blit(self.surface, self.rect, special_flags=blend_flags())
+
+
+def score_hud():
+    """The score panel at the bottom center of the screen."""
+    return HudPanel("Score: {}", midbottom=(RENDER_WIDTH / 2, RENDER_HEIGHT - px(50)))
+
+
+def present(rects=None):
+    """
+    Show display_surface in the window, like pygame.display.update(rects).
+    When drawing at a lower internal resolution, the frame is first upscaled
+    into the window surface, which is preallocated by the display module;
+    given `rects`, only those areas are upscaled.
+    """
+    if window_surface is not display_surface:
+        if rects is None:
+            pygame.transform.scale(display_surface, window_surface.get_size(), window_surface)
+        else:
+            width, height = display_surface.get_size()
+            window_width, window_height = window_surface.get_size()
+            # The scaling repeats every `step` pixels; areas aligned to it
+            # scale to exactly the pixels a whole-screen upscale would give
+            step_x = width // math.gcd(width, window_width)
+            step_y = height // math.gcd(height, window_height)
+            window_rects = []
+            for rect in rects:
+                rect = rect.clip(0, 0, width, height)
+                if not rect:
+                    continue
+                left, top = rect.left - rect.left % step_x, rect.top - rect.top % step_y
+                right, bottom = -(-rect.right // step_x) * step_x, -(-rect.bottom // step_y) * step_y
+                window_rect = pygame.Rect(
+                    left * window_width // width, top * window_height // height,
+                    (right - left) * window_width // width, (bottom - top) * window_height // height,
+                )
+                pygame.transform.scale(display_surface.subsurface(left, top, right - left, bottom - top),
+                                       window_rect.size, window_surface.subsurface(window_rect))
+                window_rects.append(window_rect)
+            rects = window_rects
+    if rects is None:
+        pygame.display.update()
+    else:
+        pygame.display.update(rects)
+
+
+_backgrounds = {}
+
+
+def background(size):
+    """
+    The static layer under the sprites, the fill colour with the game name
+    on top, built once per screen size for renderers that repaint parts of it.
+    """
+    layer = _backgrounds.get(size)
+    if layer is None:
+        layer = _backgrounds[size] = pygame.Surface(size).convert()
+        layer.fill(BACKGROUND_COLOR)
+        display_title(layer)
+    return layer
+
+
+class FullRenderer:
+    """Redraws the whole frame and presents the whole screen, every frame."""
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.score_hud = score_hud()
+        self.nebula = Nebula(surface.get_size()) if USE_NEBULA else None
+
+    def render(self, world):
+        """Draw and present one frame of `world`."""
+        if self.nebula is not None:
+            self.nebula.follow(world.time)
+            self.surface.blit(self.nebula.surface, (0, 0))
+        else:
+            # A fill only writes the screen, so it beats blitting all of background()
+            self.surface.fill(BACKGROUND_COLOR)
+        display_title(self.surface)  # Part of the background, under the sprites
+        world.draw(self.surface)
+        self.score_hud.draw(self.surface, world.score)
+        present()
+
+    def present_screen(self):
+        """Present whatever was drawn straight onto the surface (menus)."""
+        present()
+
+
+class DirtyRenderer:
+    """
+    Redraws and presents only the parts of the screen that changed.
+    Each frame, last frame's sprites are painted over from the background()
+    layer, the sprites are drawn again, and only
+    the old and new sprite areas are passed to present(). Once those
+    areas add up to more than DIRTY_AREA_THRESHOLD of the screen, it redraws
+    and presents the whole screen instead, as that is cheaper by then.
+    With USE_NEBULA the background is its own copy, repainted (and the whole
+    screen redrawn) on the frames the nebula scrolls.
+    """
+
+    def __init__(self, surface, threshold=DIRTY_AREA_THRESHOLD):
+        self.surface = surface
+        if USE_NEBULA:
+            self.nebula = Nebula(surface.get_size())
+            self.background = pygame.Surface(surface.get_size()).convert()
+            self.paint_background()
+        else:
+            self.nebula = None
+            self.background = background(surface.get_size())
+        self.score_hud = score_hud()
+        self.threshold = threshold * surface.get_width() * surface.get_height()
+        self.previous = []  # Areas drawn last frame, still to be erased
+        self.previous_area = math.inf  # Forces a full redraw on the first frame
+        self.full_frames = 0  # Frames that fell back to a full redraw
+
+    def paint_background(self):
+        """Redraw the background copy from the nebula, with the game name on top."""
+        self.background.blit(self.nebula.surface, (0, 0))
+        display_title(self.background)
+
+    def render(self, world):
+        """Draw and present one frame of `world`."""
+        surface = self.surface
+        full = self.previous_area > self.threshold
+        if self.nebula is not None and self.nebula.follow(world.time):
+            self.paint_background()
+            full = True
+        if full:
+            surface.blit(self.background, (0, 0))
+        else:
+            surface.blits([(self.background, rect, rect) for rect in self.previous], doreturn=False)
+
+        drawn = []
+        world.draw(surface, drawn)
+        drawn.append(self.score_hud.draw(surface, world.score))
+        area = sum(rect.width * rect.height for rect in drawn)  # Overlaps count twice
+
+        if full or self.previous_area + area > self.threshold:
+            self.full_frames += 1
+            present()
+        else:
+            present(self.previous + drawn)
+        self.previous = drawn
+        self.previous_area = area
+
+    def present_screen(self):
+        """Present whatever was drawn straight onto the surface (menus)."""
+        self.previous_area = math.inf  # The next frame starts from scratch
+        present()
+
+
+# Source factor, destination factor and operation of premultiplied blending,
+# for color and alpha alike
+PREMULTIPLIED_BLEND = (pygame.BLENDFACTOR_ONE, pygame.BLENDFACTOR_ONE_MINUS_SRC_ALPHA,
+                       pygame.BLENDOPERATION_ADD)
+
+
+class TextureRenderer:
+    """
+    Draws through SDL's 2D renderer (pygame._sdl2.video) instead of software
+    blits. Every image is uploaded once as a Texture, and meteors are drawn
+    from their unrotated image, turned by the renderer's angle parameter.
+    The display module's window is hidden and this renderer opens its own;
+    `surface` stays the software target of anything drawn outside render().
+    """
+
+    def __init__(self, surface):
+        if sdl2_video is None:
+            raise RuntimeError("The 'texture' renderer requires pygame._sdl2.video")
+        self.surface = surface
+        sdl2_video.Window.from_display_module().hide()
+        self.window = sdl2_video.Window(pygame.display.get_caption()[0],
+                                        size=(WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.renderer = sdl2_video.Renderer(
+            self.window, accelerated=-1 if ACCELERATED_RENDERER else 0
+        )
+        self.renderer.logical_size = surface.get_size()  # Upscaled by SDL
+        self.textures = {}  # Surface -> its Texture
+
+        # The title never changes, the score panel only when the score does (see HudPanel)
+        self.title = self.texture(title_surface)
+        self.title_rect = title_surface.get_rect(midtop=(RENDER_WIDTH / 2, px(10)))
+        self.score_hud = score_hud()
+        self.score_texture = None
+
+        # The pixel star layers of the last Starfield drawn (see draw_stars)
+        self.starfield = None
+        self.dot_textures = []
+
+        # Re-uploaded only on the frames it scrolls
+        self.nebula = None
+        if USE_NEBULA:
+            self.nebula = Nebula(surface.get_size())
+            self.nebula_texture = sdl2_video.Texture.from_surface(self.renderer, self.nebula.surface)
+
+    def texture(self, surface):
+        """The Texture of `surface`, uploaded the first time it is drawn."""
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = self.textures[surface] = self.upload(surface)
+        return texture
+
+    def upload(self, surface):
+        """A new Texture of `surface`, blending the way its pixels are stored."""
+        texture = sdl2_video.Texture.from_surface(self.renderer, surface)
+        if PREMULTIPLIED_ALPHA:
+            try:
+                texture.blend_mode = sdl2_video.Renderer.compose_custom_blend_mode(
+                    PREMULTIPLIED_BLEND, PREMULTIPLIED_BLEND
+                )
+            except RuntimeError as error:  # pygame._sdl2 raises its own error type
+                # The software renderer, for one, only has the standard modes
+                raise RuntimeError(
+                    f"This SDL renderer cannot blend premultiplied alpha ({error}); "
+                    "turn PREMULTIPLIED_ALPHA off to use the 'texture' renderer"
+                ) from error
+        return texture
+
+    def render(self, world):
+        """Draw and present one frame of `world`."""
+        renderer = self.renderer
+        if self.nebula is not None:
+            if self.nebula.follow(world.time):
+                self.nebula_texture.update(self.nebula.surface)
+            self.nebula_texture.draw()
+        else:
+            renderer.draw_color = BACKGROUND_COLOR
+            renderer.clear()
+        self.title.draw(dstrect=self.title_rect)
+        if STARFIELD == 'parallax':
+            self.draw_stars(world.stars)
+
+        drawn = 0
+        sprites = world.all_sprites.sprites()
+        for sprite in sprites:
+            if isinstance(sprite, Meteor):
+                drawn += self.draw_rotated(sprite.original_image, sprite.rect.center, sprite.rotation)
+            elif on_screen(sprite.rect):
+                self.texture(sprite.image).draw(dstrect=sprite.rect)
+                drawn += 1
+        culled = len(sprites) - drawn
+        if METEOR_STORE == 'arrays':
+            field = world.meteor_sprites
+            image = field.images[0]  # Unrotated
+            field_drawn = 0
+            for center, angle in zip(field.position[:field.count].tolist(),
+                                     field.angle[:field.count].tolist()):
+                field_drawn += self.draw_rotated(image, center, angle)
+            drawn += field_drawn
+            culled += field.count - field_drawn
+        world.cull_stats['drawn'] += drawn
+        world.cull_stats['draw_culled'] += culled
+
+        if self.score_hud.update(world.score):
+            self.score_texture = self.upload(self.score_hud.surface)
+        self.score_texture.draw(dstrect=self.score_hud.rect)
+        renderer.present()
+
+    def draw_stars(self, stars):
+        """
+        Draw a Starfield: each pixel layer from one texture of its stars at
+        their starting rows, in two parts as it scrolls around, then the
+        larger stars.
+        """
+        if stars is not self.starfield:
+            self.starfield = stars
+            self.dot_textures = []
+            for layer, color in stars.dots:
+                surface = pygame.Surface((RENDER_WIDTH, RENDER_HEIGHT), pygame.SRCALPHA)
+                pixels = pygame.surfarray.pixels2d(surface)
+                pixels[stars.column[layer], stars.start_row[layer]] = np.array(surface.map_rgb(color))
+                del pixels  # Unlocks the surface
+                self.dot_textures.append(self.upload(surface))
+        for texture, offset in zip(self.dot_textures, stars.offsets().tolist()):
+            rest = RENDER_HEIGHT - offset
+            texture.draw(srcrect=(0, 0, RENDER_WIDTH, rest), dstrect=(0, offset, RENDER_WIDTH, rest))
+            if offset:  # The rows scrolled past the bottom, back at the top
+                texture.draw(srcrect=(0, rest, RENDER_WIDTH, offset), dstrect=(0, 0, RENDER_WIDTH, offset))
+        for layer, image in stars.images:
+            texture = self.texture(image)
+            for position in stars.positions(layer):
+                texture.draw(dstrect=position)
+
+    def draw_rotated(self, image, center, angle):
+        """
+        Draw `image` centred on `center`, turned `angle` degrees counterclockwise.
+        Returns False, drawing nothing, if it would be off-screen.
+        """
+        texture = self.texture(image)
+        rect = texture.get_rect(center=center)
+        if not on_screen(rect):
+            return False
+        texture.draw(dstrect=rect, angle=-angle)  # SDL turns clockwise
+        return True
+
+    def present_screen(self):
+        """Present whatever was drawn straight onto the surface (menus)."""
+        sdl2_video.Texture.from_surface(self.renderer, self.surface).draw()
+        self.renderer.present()
+
+
+# Renderer class for each RENDERER setting
+RENDERERS = {
+    'full': FullRenderer,
+    'dirty': DirtyRenderer,
+    'texture': TextureRenderer,
+}
 
 
 ###############################################################################
 #                            GAME LOGIC FUNCTIONS                             #
 ###############################################################################
 
-def display_score(score):
-    """Display the current score in the bottom center of the screen."""
-    text_surface = font.render(f"Score: {score}", True, (240, 240, 240))
-    text_rect = text_surface.get_frect(midbottom=(WINDOW_WIDTH / 2, WINDOW_HEIGHT - 50))
+def display_title(surface):
+    """Draw the game name at the top center of `surface`."""
+    surface.blit(title_surface, title_surface.get_rect(midtop=(surface.get_width() / 2, px(10))),
+                 special_flags=blend_flags())
+
+def collide_rect_circle(left, right):
+    """Rect test first, bounding-circle test only if that passes."""
+    return left.rect.colliderect(right.rect) and pygame.sprite.collide_circle(left, right)
+
+def collide_circle_mask(left, right):
+    """collide_rect_circle first, pixel-perfect mask test only if that passes."""
+    return collide_rect_circle(left, right) and pygame.sprite.collide_mask(left, right)
+
+# Narrow-phase test for each COLLISION_FIDELITY tier (None = plain rect test)
+COLLIDERS = {
+    'aabb': None,
+    'circle': collide_rect_circle,
+    'mask': collide_circle_mask,
+}
 
-    # Draw a semi-transparent rect behind the text
-    pygame.draw.rect(display_surface, (240, 240, 240),
-                     text_rect.inflate(20, 10).move(0, -8), width=1, border_radius=10)
+def sweep_candidates(player, meteor_sprites, laser_sprites, sweep):
+    """
+    Run the sweep-and-prune broad phase `sweep` over the player, lasers and meteors.
 
-    display_surface.blit(text_surface, text_rect)
+    Returns:
+        near_player (list): Meteors whose rect overlaps the player's.
+        near_lasers (dict): Laser -> list of meteors whose rect overlaps it.
+    """
+    sweep.sync([player, *laser_sprites, *meteor_sprites])
+    near_player = []
+    near_lasers = {}
+    for a, b in sweep.pairs():
+        if isinstance(a, Meteor):
+            a, b = b, a
+        if not isinstance(b, Meteor) or isinstance(a, Meteor):
+            continue  # Only pairs involving exactly one meteor matter
+        if a is player:
+            near_player.append(b)
+        else:
+            near_lasers.setdefault(a, []).append(b)
+    return near_player, near_lasers
 
-def collisions(player, meteor_sprites, laser_sprites, explosion_frames):
+def batch_candidates(player, meteor_sprites, laser_sprites):
+    """
+    Vectorized broad phase: tests every laser against every meteor, and the
+    player against every meteor, in a handful of NumPy array operations.
+
+    Returns the same (near_player, near_lasers) pair as sweep_candidates(),
+    with near_player already filtered by the bounding-circle test unless the
+    player-meteor fidelity is 'aabb'.
+    """
+    if np is None:
+        raise RuntimeError("The 'numpy' collision backend requires NumPy")
+
+    meteors = meteor_sprites.sprites()
+    lasers = laser_sprites.sprites()
+    near_lasers = {}
+    if not meteors:
+        return [], near_lasers
+
+    # Meteor rects as columns: left, top, width, height
+    rects = np.array([tuple(meteor.rect) for meteor in meteors], dtype=float)
+    m_left, m_top, m_width, m_height = rects.T
+    m_right = m_left + m_width
+    m_bottom = m_top + m_height
+
+    # Player - Meteor: rect overlap, plus bounding circles unless the tier is 'aabb'
+    p = player.rect
+    near = ((m_left < p.right) & (p.left < m_right)
+            & (m_top < p.bottom) & (p.top < m_bottom))
+    if COLLISION_FIDELITY['player_meteor'] != 'aabb':
+        radii = np.array([meteor.radius for meteor in meteors], dtype=float)
+        dx = m_left + m_width / 2 - p.centerx
+        dy = m_top + m_height / 2 - p.centery
+        near &= dx * dx + dy * dy <= (radii + player.radius) ** 2
+    near_player = [meteors[i] for i in np.flatnonzero(near)]
+
+    # Lasers are tested against the meteors' swept bounds in swept mode
+    if SWEPT_COLLISIONS:
+        rects = np.array([tuple(swept_bounds(meteor)) for meteor in meteors], dtype=float)
+        m_left, m_top, m_width, m_height = rects.T
+        m_right = m_left + m_width
+        m_bottom = m_top + m_height
+
+    # Laser - Meteor: full (lasers x meteors) hit matrix in one broadcast
+    if lasers:
+        l_left, l_top, l_width, l_height = np.array(
+            [tuple(broad_rect(laser)) for laser in lasers], dtype=float
+        ).T[:, :, None]
+        hits = ((l_left < m_right) & (m_left < l_left + l_width)
+                & (l_top < m_bottom) & (m_top < l_top + l_height))
+        for row in np.flatnonzero(hits.any(axis=1)):
+            near_lasers[lasers[row]] = [meteors[i] for i in np.flatnonzero(hits[row])]
+
+    return near_player, near_lasers
+
+def field_collisions(player, field, laser_sprites, events):
+    """
+    collisions() for a MeteorField: rect (or circle) tests run on every meteor
+    at once, and only the candidates become MeteorViews for the narrow phase.
+    The collision backend setting does not apply here.
+    """
+    indices = field.frame_indices()
+    left, top, right, bottom = field.rects(indices)
+    alive = np.ones(field.count, dtype=bool)
+
+    # Player - Meteor collision
+    tier = COLLISION_FIDELITY['player_meteor']
+    p = player.rect
+    near = (left < p.right) & (p.left < right) & (top < p.bottom) & (p.top < bottom)
+    if tier != 'aabb':
+        offset = field.position[:field.count] - p.center
+        near &= (offset * offset).sum(axis=1) <= (field.radii[indices] + player.radius) ** 2
+    collided = COLLIDERS[tier]
+    for i in np.flatnonzero(near):
+        if collided is None or collided(player, field.view(i, indices)):
+            alive[i] = False
+            events.player_hit = True
+
+    # Laser - Meteor collision, against swept bounds in swept mode
+    if SWEPT_COLLISIONS:
+        collided = collide_swept
+        half = field.half_sizes[indices]
+        previous = field.previous[:field.count]
+        left = np.minimum(left, previous[:, 0] - half[:, 0])
+        top = np.minimum(top, previous[:, 1] - half[:, 1])
+        right = np.maximum(right, previous[:, 0] + half[:, 0])
+        bottom = np.maximum(bottom, previous[:, 1] + half[:, 1])
+    else:
+        collided = COLLIDERS[COLLISION_FIDELITY['laser_meteor']]
+    for laser in laser_sprites:
+        r = broad_rect(laser)
+        hits = alive & (left < r.right) & (r.left < right) & (top < r.bottom) & (r.top < bottom)
+        if not hits.any():
+            continue
+        hit_meteors = [(i, field.view(i, indices)) for i in np.flatnonzero(hits)]
+        if collided is not None:
+            hit_meteors = [(i, view) for i, view in hit_meteors if collided(laser, view)]
+        if hit_meteors:
+            laser.kill()
+            alive[[i for i, _ in hit_meteors]] = False
+            events.hit_positions.append(laser.rect.midtop)
+            events.hit_counts.append(len(hit_meteors))
+            events.lasers.append(laser)
+            events.meteors.extend(view for _, view in hit_meteors)
+
+    field.remove(~alive)
+    return events
+
+def collisions(player, meteor_sprites, laser_sprites, events, grid, sweep):
     """
     Handle collisions between:
     - Player and Meteors
     - Lasers and Meteors
 
+    Hit sprites are killed, but sounds, explosions and scoring are left to the
+    collision event consumers so this stays a tight loop. `grid` and `sweep`
+    are the world's broad-phase structures.
+
     Returns:
-        hit_player (bool): True if the player is hit by a meteor, otherwise False.
-        score_increase (int): The score increment from meteor-laser collisions.
+        events (CollisionEvents): `events` with this step's hits appended and
+        player_hit set if a meteor reached the player.
     """
+    if isinstance(meteor_sprites, MeteorField):
+        return field_collisions(player, meteor_sprites, laser_sprites, events)
+
+    player_collided = COLLIDERS[COLLISION_FIDELITY['player_meteor']]
+    if SWEPT_COLLISIONS:
+        laser_collided = collide_swept
+    else:
+        laser_collided = COLLIDERS[COLLISION_FIDELITY['laser_meteor']]
+
     # Player - Meteor collision
-    hit_player = pygame.sprite.spritecollide(
-        player, meteor_sprites, True, pygame.sprite.collide_mask
-    )
-    player_hit = len(hit_player) > 0  # True if any meteor collided
+    if COLLISION_BACKEND == 'sap':
+        near_player, near_lasers = sweep_candidates(player, meteor_sprites, laser_sprites, sweep)
+    elif COLLISION_BACKEND == 'numpy':
+        near_player, near_lasers = batch_candidates(player, meteor_sprites, laser_sprites)
+    if COLLISION_BACKEND in ('sap', 'numpy'):
+        # Swept mode pairs the player by its swept bounds too, but player hits
+        # stay discrete: a rect test still has to confirm the 'aabb' tier
+        collided = player_collided or pygame.sprite.collide_rect
+        hit_player = [m for m in near_player if collided(player, m)]
+        for meteor in hit_player:
+            meteor.kill()
+    else:
+        hit_player = pygame.sprite.spritecollide(
+            player, meteor_sprites, True, player_collided
+        )
+    if hit_player:
+        events.player_hit = True
 
     # Laser - Meteor collision
-    score_increase = 0
+    if COLLISION_BACKEND == 'grid':
+        grid.sync(meteor_sprites)
     for laser in laser_sprites:
-        hit_meteors = pygame.sprite.spritecollide(
-            laser, meteor_sprites, dokill=True
-        )
+        if COLLISION_BACKEND == 'grid':
+            hit_meteors = grid.spritecollide(laser, True, laser_collided)
+        elif COLLISION_BACKEND in ('sap', 'numpy'):
+            hit_meteors = [
+                m for m in near_lasers.get(laser, ())
+                if m in meteor_sprites and (laser_collided is None or laser_collided(laser, m))
+            ]
+            for meteor in hit_meteors:
+                meteor.kill()
+        else:
+            hit_meteors = pygame.sprite.spritecollide(
+                laser, meteor_sprites, True, laser_collided
+            )
         if hit_meteors:
             laser.kill()
-            # Explosion at laser's position
-            AnimatedExplosion(explosion_frames, laser.rect.midtop, all_sprites)
-            explosion_sound.play()
-            # Increase score for each meteor destroyed
-            score_increase += 10 * len(hit_meteors)
+            events.hit_positions.append(laser.rect.midtop)
+            events.hit_counts.append(len(hit_meteors))
+            events.lasers.append(laser)
+            events.meteors.extend(hit_meteors)
 
-    return player_hit, score_increase
+    return events
 
 
-def show_game_over_screen():
+def show_game_over_screen(renderer):
     """
     Display a 'Game Over' screen with options to restart or quit.
     Allows the player to press 'R' to restart or 'Q' to quit.
@@ -242,7 +2194,7 @@ def show_game_over_screen():
     # Simple "Game Over" loop
     while True:
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):  # See run_game()
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.KEYDOWN:
@@ -256,21 +2208,21 @@ def show_game_over_screen():
         display_surface.fill('#1a1a1a')
 
         # Game Over text
-        game_over_surface = font.render("GAME OVER", True, (240, 50, 50))
-        game_over_rect = game_over_surface.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2 - 100))
+        game_over_surface = hud_font.render("GAME OVER", True, (240, 50, 50))
+        game_over_rect = game_over_surface.get_rect(center=(RENDER_WIDTH / 2, RENDER_HEIGHT / 2 - px(100)))
         display_surface.blit(game_over_surface, game_over_rect)
 
         # Restart instructions
-        restart_surface = font.render("Press R to Restart", True, (240, 240, 240))
-        restart_rect = restart_surface.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2))
+        restart_surface = hud_font.render("Press R to Restart", True, (240, 240, 240))
+        restart_rect = restart_surface.get_rect(center=(RENDER_WIDTH / 2, RENDER_HEIGHT / 2))
         display_surface.blit(restart_surface, restart_rect)
 
         # Quit instructions
-        quit_surface = font.render("Press Q to Quit", True, (240, 240, 240))
-        quit_rect = quit_surface.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2 + 100))
+        quit_surface = hud_font.render("Press Q to Quit", True, (240, 240, 240))
+        quit_rect = quit_surface.get_rect(center=(RENDER_WIDTH / 2, RENDER_HEIGHT / 2 + px(100)))
         display_surface.blit(quit_surface, quit_rect)
 
-        pygame.display.update()
+        renderer.present_screen()
         clock.tick(FPS)
 
 
@@ -278,73 +2230,50 @@ def show_game_over_screen():
 def run_game():
     """
     Main function to run the game loop.
-    - Initializes groups and sprites.
+    - Creates a World for every game.
     - Runs the main loop for gameplay until player is hit.
     - Shows a game over screen afterward with options to restart or quit.
     """
+    renderer = RENDERERS[RENDERER](display_surface)
+
     while True:  # Loop to allow restarting the game
         game_over_music.stop()
         # Initialize music
         game_music.play(loops=-1)
 
-        # Create sprite groups
-        global all_sprites, meteor_sprites, laser_sprites
-        all_sprites = pygame.sprite.Group()
-        meteor_sprites = pygame.sprite.Group()
-        laser_sprites = pygame.sprite.Group()
-
-        # Create Player
-        player = Player(all_sprites)
+        # Build the meteor rotation frames up front rather than on first spawn
+        rotation_cache.frames(meteor_surface)
 
-        # Create initial stars
-        for _ in range(20):
-            Star(all_sprites, star_surface)
-
-        # Reset score and running state
-        score = 0
-        is_game_running = True
+        # Create a fresh world: groups, player, stars, score and meteor spawns
+        world = World()
 
         # Main game loop
-        while is_game_running:
+        while not world.game_over:
             dt = clock.tick(FPS) / 1000  # Delta time in seconds
 
             for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+                # The 'texture' renderer keeps the display module's window
+                # open but hidden, and SDL only sends QUIT once the last
+                # window closes, so closing its window is a WINDOWCLOSE alone
+                if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
                     pygame.quit()
                     sys.exit()
 
-                if event.type == METEOR_EVENT:
-                    x, y = randint(0, WINDOW_WIDTH), randint(-200, -100)
-                    Meteor(meteor_surface, (x, y), (all_sprites, meteor_sprites))
-
-            # Update sprites
-            all_sprites.update(dt)
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    world.player.fire_queued = True
 
-            # Check collisions
-            player_hit, score_increase = collisions(
-                player, meteor_sprites, laser_sprites, explosion_frames
-            )
-            if player_hit:
-                # Player is hit -> stop game
-                is_game_running = False
-            score += score_increase
-
-            # Draw everything
-            display_surface.fill('#3a2e3f')
-            all_sprites.draw(display_surface)
+            # Simulate the frame; the player being hit ends the game
+            events = world.advance(dt)
+            play_collision_sounds(events)
 
-            # Display the score
-            display_score(score)
+            # Draw everything: sprites, score and game name
+            renderer.render(world)
 
-            # Display game name
-            game_name_surface = game_font.render("SpaceShooties", True, (240, 240, 240))
-            game_name_rect = game_name_surface.get_rect(midtop=(WINDOW_WIDTH / 2, 10))
-            display_surface.blit(game_name_surface, game_name_rect)
-
-            pygame.display.update()
+        # Hand every pooled sprite back before the world is thrown away
+        world.close()
 
         # If we exit the while loop, it means the player got hit -> game over
-        show_game_over_screen()
+        show_game_over_screen(renderer)
 
 
 
@@ -353,11 +2282,6 @@ def run_game():
 ###############################################################################
 
 if __name__ == "__main__":
-    # These two variables are declared here to align with your original code.
-    # They get updated in run_game() and collisions().
-    score = 0
-    is_game_running = True
-
     run_game()
 
     # Once the user closes the Game Over screen, we exit.
@@ -0,0 +1,120 @@
+"""
+Collision tests for SpaceShooties: backend parity, swept collisions and the
+collision event batch.
+
+Run from the project root so the asset paths resolve, for example:
+    python -m pytest code
+"""
+
+import random
+
+import pygame
+import pytest
+
+from conftest import collision_backends, make_scene, to_field
+import game
+
+SCENES = 50  # Random scenes per parity configuration
+MOTION = 60  # Farthest a sprite moved during the step, per axis, in pixels
+
+
+def run_scene(backend, seed):
+    """
+    One collisions() pass with `backend` over a random scene, every sprite
+    given a random path into its position for swept mode to test.
+    Returns (player_hit, hit positions, hits per laser, surviving meteors).
+    """
+    game.COLLISION_BACKEND = backend
+    rng = random.Random(seed)
+    lasers, meteors = rng.randint(0, 60), rng.randint(0, 60)
+    player_pos = (rng.uniform(0, game.RENDER_WIDTH), rng.uniform(0, game.RENDER_HEIGHT))
+    world = make_scene(lasers, meteors, seed, player_pos=player_pos)
+    for sprite in (world.player, *world.laser_sprites, *world.meteor_sprites):
+        x, y = sprite.rect.center
+        sprite.previous_center = (x + rng.uniform(-MOTION, MOTION), y + rng.uniform(-MOTION, MOTION))
+    meteor_sprites = world.meteor_sprites
+    if backend == 'field':
+        meteor_sprites = to_field(meteor_sprites)
+    events = game.collisions(world.player, meteor_sprites, world.laser_sprites, world.events,
+                             world.meteor_grid, world.collision_sweep)
+    result = (events.player_hit, tuple(events.hit_positions), tuple(events.hit_counts),
+              len(meteor_sprites))
+    world.close()
+    return result
+
+
+@pytest.fixture(autouse=True)
+def restore_settings(monkeypatch):
+    """Undo the collision settings a test changes."""
+    monkeypatch.setattr(game, 'COLLISION_BACKEND', game.COLLISION_BACKEND)
+    monkeypatch.setattr(game, 'SWEPT_COLLISIONS', game.SWEPT_COLLISIONS)
+    monkeypatch.setattr(game, 'COLLISION_FIDELITY', dict(game.COLLISION_FIDELITY))
+    monkeypatch.setattr(game, 'METEOR_STORE', game.METEOR_STORE)
+
+
+@pytest.mark.parametrize('swept', (False, True), ids=('discrete', 'swept'))
+@pytest.mark.parametrize('laser_tier', list(game.COLLIDERS))
+@pytest.mark.parametrize('player_tier', list(game.COLLIDERS))
+def test_backends_match_spritecollide(player_tier, laser_tier, swept):
+    """Every backend finds exactly the hits spritecollide finds, in the same order."""
+    game.SWEPT_COLLISIONS = swept
+    game.COLLISION_FIDELITY.update(player_meteor=player_tier, laser_meteor=laser_tier)
+    for seed in range(SCENES):
+        expected = run_scene('spritecollide', seed)
+        for backend in collision_backends():
+            assert run_scene(backend, seed) == expected, f"scene {seed}, {backend}"
+
+
+# name, step dt, meteor direction, meteor speed, laser offset from meteor centre,
+# discrete hit expected, swept hit expected
+TUNNELING_CASES = (
+    # Game speeds: the laser clips the meteor's corner between two 30 Hz steps
+    ('corner, 30 Hz step', 1 / 30, (0.5, 1), 600, (60, -18), False, True),
+    ('head-on, 250 ms hitch', 0.25, (0, 1), 500, (0, 150), False, True),
+    ('diagonal, 250 ms hitch', 0.25, (0.5, 1), 500, (40, 150), False, True),
+    ('near miss, 250 ms hitch', 0.25, (0, 1), 500, (80, 150), False, False),
+)
+
+
+@pytest.mark.parametrize('swept', (False, True), ids=('discrete', 'swept'))
+@pytest.mark.parametrize('backend', collision_backends())
+@pytest.mark.parametrize('case', TUNNELING_CASES, ids=[case[0] for case in TUNNELING_CASES])
+def test_tunneling(case, backend, swept):
+    """Swept collisions catch the laser hits a discrete test steps over, and only those."""
+    _, dt, direction, speed, offset, discrete_hit, swept_hit = case
+    game.SWEPT_COLLISIONS = swept
+    game.COLLISION_BACKEND = backend
+    game.METEOR_STORE = 'arrays' if backend == 'field' else 'sprites'
+    world = make_scene(0, 0, 0)
+    center = (game.RENDER_WIDTH / 2, game.RENDER_HEIGHT / 3)
+    if backend == 'field':
+        field = world.meteor_sprites
+        field.spawn(center)
+        field.velocity[0] = pygame.Vector2(direction) * speed
+        field.spin[0] = 0
+        meteor_rect = field.view(0, field.frame_indices()).rect
+    else:
+        meteor = game.Meteor(game.meteor_surface, center, world)
+        meteor.direction = pygame.Vector2(direction)
+        meteor.speed = speed
+        meteor.rotation_speed = 0
+        meteor_rect = meteor.rect
+    laser = game.Laser(game.laser_surface, (center[0] + offset[0], center[1] + offset[1]), world)
+    assert not laser.rect.colliderect(meteor_rect), "the case must start apart"
+    world.step(dt)
+    world.close()
+    assert bool(world.events.hit_positions) == (swept_hit if swept else discrete_hit)
+
+
+def test_batch_never_names_a_reused_sprite(monkeypatch):
+    """Sprites hit in one step of a frame are not respawned by a later step."""
+    # Several fixed steps per frame, so spawns follow hits within one batch
+    monkeypatch.setattr(game, 'SIMULATION_RATE', 60)
+    world = game.World(5, headless=True)
+    for _ in range(300):
+        world.player.fire_queued = True
+        events = world.advance(0.05)
+        assert not any(sprite.alive() for sprite in events.lasers + events.meteors)
+        if world.game_over:
+            break
+    world.close()